@@ -149,7 +149,9 @@ class AirdropFarmer:
 
     def _notify(self, text: str):
         try:
-            telegram_notifier.send_message(text)
+            # Synchronous: a queued send can't report failure
+            if telegram_notifier.send_message(text, flush_async=False) is None:
+                logger.warning("Telegram notification not sent")
         except Exception as exc:
             logger.warning("Telegram notification failed: %s", exc)
 
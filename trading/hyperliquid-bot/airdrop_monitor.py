@@ -65,8 +65,12 @@ def _send_telegram(text: str) -> bool:
     """Try to send via telegram_notifier. Falls back to logging."""
     try:
         import telegram_notifier
-        result = telegram_notifier.send_message(text)
-        return result is not None
+        # Send now: a queued message always looks delivered, so no fallback
+        result = telegram_notifier.send_message(text, flush_async=False)
+        if result is not None:
+            return True
+        logger.info("TELEGRAM MESSAGE:\n%s", text)
+        return False
     except Exception as exc:
         logger.warning("Telegram not available (%s), logging instead.", exc)
         logger.info("TELEGRAM MESSAGE:\n%s", text)
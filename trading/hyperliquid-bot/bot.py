@@ -1,7 +1,12 @@
 """Hyperliquid Trading Bot v7 — Unified: AI + Liquidity Zones + Self-Optimization + HIP-3 + Adaptive Strategy"""
 
+import os
 import time
 import logging
+import signal
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 from hyperliquid.exchange import Exchange
@@ -9,8 +14,9 @@ from hyperliquid.info import Info
 from hyperliquid.utils import constants
 from eth_account import Account
 import config
+import http_pool
 from sentiment import SentimentAnalyzer
-from indicators import get_all_signals
+from indicators import get_all_signals, candles_to_array
 from liquidity import analyze_liquidity_zones
 from strategy_optimizer import StrategyOptimizer
 from trade_tracker import TradeTracker
@@ -36,13 +42,29 @@ _alert_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(m
 alert_logger.addHandler(_alert_handler)
 
 
+# Candle interval -> bar duration (ms)
+_INTERVAL_MS = {"1m": 60000, "5m": 300000, "15m": 900000, "1h": 3600000, "4h": 14400000}
+
+# Macro strategy optimization cadence
+OPTIMIZE_INTERVAL_SEC = 5 * 3600
+
+
+def _pack_rules(*rules) -> int:
+    """Pack scoring rule outcomes into a bitmask (bit i set when rule i fired)"""
+    mask = 0
+    for i, fired in enumerate(rules):
+        if fired:
+            mask |= 1 << i
+    return mask
+
+
 class HyperliquidBot:
     def __init__(self):
         self.account = Account.from_key(config.API_SECRET)
         # Initialize SDK with multi-dex support (default perps + xyz HIP-3)
         self.info = Info(
             constants.MAINNET_API_URL,
-            skip_ws=True,
+            skip_ws=not config.USE_WEBSOCKET,
             perp_dexs=config.PERP_DEXS
         )
         self.exchange = Exchange(
@@ -51,6 +73,10 @@ class HyperliquidBot:
             account_address=config.ACCOUNT_ADDRESS,
             perp_dexs=config.PERP_DEXS
         )
+        http_pool.share_session(self.info, self.exchange)
+
+        # Short-lived user_state cache per dex: {dex: (monotonic_ts, state)}
+        self._user_state_cache = {}
 
         # Fetch asset metadata (szDecimals for proper size rounding)
         self.sz_decimals = {}
@@ -76,6 +102,11 @@ class HyperliquidBot:
         self.peak_balance = self.initial_balance
         self.session_start = datetime.now()
         self.paused = False
+        # Wakes the paused loop early: drawdown recovery or operator SIGUSR1
+        # (e.g. `kill -USR1 <pid>` after a deposit to re-check immediately)
+        self._resume_event = threading.Event()
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self._resume_event.set())
 
         # AI sentiment
         self.sentiment_analyzer = SentimentAnalyzer()
@@ -83,13 +114,24 @@ class HyperliquidBot:
 
         # Strategy optimizer — macro/regime detection (v6)
         self.optimizer = StrategyOptimizer(perplexity_key=config.PERPLEXITY_API_KEY)
-        self.last_optimization = None
+        self._next_optimize_monotonic = 0.0  # Due immediately on first loop
+        # Fills are fetched incrementally from here (ms) when positions close
+        self._last_fill_ts = int(time.time() * 1000)
+
+        # Per-iteration status line throttle (see _status_log_level)
+        self._last_status_log_mono = 0.0
+        self._last_status_positions = -1
         self.regime_adjustments = {}
 
         # Track open trade IDs for optimizer
         self.open_trade_ids = {}
         self.last_known_positions = set()
 
+        # Typed candle arrays per (asset, interval), keyed by the last candle
+        self._candle_arrays = {}
+        # Higher-timeframe candles per (asset, interval): (bar index, candles)
+        self._htf_candles = {}
+
         # Trailing stop tracking (v5)
         self.peak_pnl = {}
         
@@ -100,6 +142,19 @@ class HyperliquidBot:
         self.tracker = TradeTracker()
         self.adapter = StrategyAdapter(self.tracker)
 
+        # Tracker writes stay synchronous under _tracker_lock (the main loop
+        # reads them); telegram_notifier already sends on its own worker thread
+        self._tracker_lock = threading.Lock()
+
+        # Worker pool for concurrent per-asset entry scans (blocking SDK calls)
+        self._scan_pool = ThreadPoolExecutor(max_workers=config.SCAN_WORKERS, thread_name_prefix="scan")
+
+        # Event-driven wake-ups: set by websocket callbacks (fills, new candles)
+        self._tick = threading.Event()
+        self._ws_bar = {}
+        if config.USE_WEBSOCKET:
+            self._subscribe_events()
+
         # Clean start: cancel any orphaned orders on both dexes
         self._cancel_all_orders()
 
@@ -122,6 +177,49 @@ class HyperliquidBot:
             except Exception as e:
                 logger.warning("Order cleanup failed [%s]: %s", dex if dex else "default", e)
 
+    def _subscribe_events(self):
+        """Subscribe to fills and per-asset candles so the loop wakes on real events"""
+        try:
+            self.info.subscribe(
+                {"type": "userEvents", "user": config.ACCOUNT_ADDRESS}, self._on_user_event
+            )
+        except Exception as e:
+            logger.warning("userEvents subscription failed: %s", e)
+        for asset in config.ASSETS:
+            try:
+                self.info.subscribe(
+                    {"type": "candle", "coin": asset, "interval": config.CANDLE_INTERVAL},
+                    self._on_candle
+                )
+            except Exception as e:
+                logger.warning("Candle subscription failed for %s: %s", asset, e)
+
+    def _on_user_event(self, msg):
+        """Websocket callback: fills / liquidations -> wake the main loop"""
+        self._tick.set()
+
+    def _on_candle(self, msg):
+        """Websocket callback: wake the main loop only when a new bar opens"""
+        data = msg.get("data") or {}
+        coin, start = data.get("s"), data.get("t")
+        if self._ws_bar.get(coin) != start:
+            self._ws_bar[coin] = start
+            self._tick.set()
+
+    def _touch_heartbeat(self):
+        """Bump the heartbeat file's mtime; healthcheck.py reads it instead of polling tmux"""
+        try:
+            os.utime(config.HEARTBEAT_FILE)
+        except FileNotFoundError:
+            open(config.HEARTBEAT_FILE, "a").close()
+        except OSError as e:
+            logger.debug("Heartbeat touch failed: %s", e)
+
+    def _wait_for_tick(self):
+        """Block until a websocket event arrives or CHECK_INTERVAL_SEC elapses"""
+        self._tick.wait(timeout=config.CHECK_INTERVAL_SEC)
+        self._tick.clear()
+
     def get_tier(self) -> Dict:
         balance = self.get_account_value()
         for tier in config.TIERS:
@@ -144,12 +242,26 @@ class HyperliquidBot:
             except Exception as e:
                 logger.warning("Leverage set failed for %s: %s", asset, e)
 
+    def _get_user_state_cached(self, dex: str, ttl: float = 5.0) -> Dict:
+        """user_state for one dex, reused for `ttl` seconds (covers balance + positions)"""
+        now = time.monotonic()
+        cached = self._user_state_cache.get(dex)
+        if cached and now - cached[0] < ttl:
+            return cached[1]
+        state = self.info.user_state(config.ACCOUNT_ADDRESS, dex=dex)
+        self._user_state_cache[dex] = (now, state)
+        return state
+
+    def _invalidate_user_state(self):
+        """Drop cached user_state — call at loop start and after anything that moves funds"""
+        self._user_state_cache.clear()
+
     def get_account_value(self) -> float:
         """Get total account value across all dexes"""
         total = 0.0
         for dex in config.PERP_DEXS:
             try:
-                state = self.info.user_state(config.ACCOUNT_ADDRESS, dex=dex)
+                state = self._get_user_state_cached(dex)
                 total += float(state["marginSummary"]["accountValue"])
             except Exception as e:
                 logger.error("Error getting account value [%s]: %s", dex if dex else "default", e)
@@ -158,7 +270,7 @@ class HyperliquidBot:
     def _get_dex_balance(self, dex: str) -> Dict:
         """Get balance details for a specific dex"""
         try:
-            state = self.info.user_state(config.ACCOUNT_ADDRESS, dex=dex)
+            state = self._get_user_state_cached(dex)
             ms = state["marginSummary"]
             return {
                 "accountValue": float(ms["accountValue"]),
@@ -189,6 +301,7 @@ class HyperliquidBot:
                 amount=round(amount, 2)
             )
             logger.info("Transferred $%.2f to xyz dex: %s", amount, result)
+            self._invalidate_user_state()
             time.sleep(2)
             return True
         except Exception as e:
@@ -212,6 +325,7 @@ class HyperliquidBot:
                 amount=round(transfer_amount, 2)
             )
             logger.info("Transferred $%.2f from xyz dex back: %s", transfer_amount, result)
+            self._invalidate_user_state()
             time.sleep(2)
             return True
         except Exception as e:
@@ -223,7 +337,7 @@ class HyperliquidBot:
         positions = []
         for dex in config.PERP_DEXS:
             try:
-                state = self.info.user_state(config.ACCOUNT_ADDRESS, dex=dex)
+                state = self._get_user_state_cached(dex)
                 for pos in state.get("assetPositions", []):
                     p = pos["position"]
                     if abs(float(p.get("szi", 0))) > 0:
@@ -235,7 +349,7 @@ class HyperliquidBot:
     def get_candles_raw(self, asset: str, num_candles: int = 100, interval: str = None) -> Optional[list]:
         try:
             intv = interval or config.CANDLE_INTERVAL
-            dur_ms = {"1m": 60000, "5m": 300000, "15m": 900000, "1h": 3600000, "4h": 14400000}.get(intv, 900000)
+            dur_ms = _INTERVAL_MS.get(intv, 900000)
             now_ms = int(time.time() * 1000)
             candles = self.info.candles_snapshot(
                 name=asset,
@@ -248,23 +362,45 @@ class HyperliquidBot:
             logger.error("Error fetching candles for %s: %s", asset, e)
             return None
 
+    def get_candles_htf(self, asset: str, num_candles: int, interval: str) -> Optional[list]:
+        """Fetch 1h/4h candles at most once per bar — reuse them until a new bar opens"""
+        bar = int(time.time() * 1000) // _INTERVAL_MS[interval]
+        cached = self._htf_candles.get((asset, interval))
+        if cached and cached[0] == bar:
+            return cached[1]
+        candles = self.get_candles_raw(asset, num_candles, interval=interval)
+        if candles:
+            self._htf_candles[(asset, interval)] = (bar, candles)
+        return candles
+
+    def _candle_array(self, asset: str, interval: str, candles: list):
+        """Return the candles as a float array, reusing the last one if unchanged"""
+        last = candles[-1]
+        stamp = (len(candles), last.get("t"), last.get("c"), last.get("v"))
+        cached = self._candle_arrays.get((asset, interval))
+        if cached and cached[0] == stamp:
+            return cached[1]
+        arr = candles_to_array(candles)
+        self._candle_arrays[(asset, interval)] = (stamp, arr)
+        return arr
+
     def get_ai_bias(self, asset: str) -> Dict:
-        now = datetime.now()
+        now_mono = time.monotonic()
         # For AI analysis, use base asset name (strip xyz: prefix)
         ai_asset = asset.split(":")[-1] if ":" in asset else asset
         cached = self.cached_bias.get(asset)
 
-        if cached:
-            age = (now - cached["timestamp"]).total_seconds() / 60
-            if age < config.SENTIMENT_CHECK_INTERVAL_MIN:
-                return {"bias": cached["bias"], "score": cached["score"]}
+        # Monotonic age check — immune to NTP steps / wall-clock changes
+        if cached and now_mono - cached["mono"] < config.SENTIMENT_CHECK_INTERVAL_MIN * 60:
+            return {"bias": cached["bias"], "score": cached["score"]}
 
         try:
             result = self.sentiment_analyzer.get_combined_bias(ai_asset)
             self.cached_bias[asset] = {
                 "bias": result["bias"],
                 "score": result["score"],
-                "timestamp": now
+                "mono": now_mono,
+                "timestamp": datetime.now()
             }
             return {"bias": result["bias"], "score": result["score"]}
         except Exception as e:
@@ -297,7 +433,7 @@ class HyperliquidBot:
             return None
 
         signals = get_all_signals(
-            candles,
+            self._candle_array(asset, config.CANDLE_INTERVAL, candles),
             bb_period=config.BB_PERIOD,
             bb_std=config.BB_STD,
             rsi_period=config.RSI_PERIOD,
@@ -309,7 +445,7 @@ class HyperliquidBot:
         price = signals["price"]
 
         # Liquidity zone analysis (use 1h candles for broader picture)
-        candles_1h = self.get_candles_raw(asset, 100, interval="1h")
+        candles_1h = self.get_candles_htf(asset, 100, "1h")
         liq_zones = None
         if candles_1h:
             liq_zones = analyze_liquidity_zones(candles_1h, price)
@@ -335,7 +471,7 @@ class HyperliquidBot:
         # === EXTREME OVERSOLD BOUNCE (1h macro check) ===
         signals_1h = None
         if candles_1h:
-            signals_1h = get_all_signals(candles_1h)
+            signals_1h = get_all_signals(self._candle_array(asset, "1h", candles_1h))
             if signals_1h and signals_1h["rsi"] < config.EXTREME_RSI_THRESHOLD:
                 logger.info(
                     "EXTREME OVERSOLD on %s: 1h RSI=%.1f, 15m RSI=%.1f — LONG bounce play",
@@ -350,87 +486,62 @@ class HyperliquidBot:
         # === VOLUME GATE: technical signals only count if volume confirmed ===
         volume_confirmed = signals.get("volume_confirmed", False)
 
-        # === SCORING SYSTEM v7: 8+ sources ===
-        long_score = 0
-        short_score = 0
-
-        # 1. Bollinger Band position (volume gated)
-        if volume_confirmed:
-            if signals["below_lower_bb"]:
-                long_score += 1
-            if signals["above_upper_bb"]:
-                short_score += 1
-
-            # 2. RSI levels (35/65, volume gated)
-            if signals["rsi_oversold"]:
-                long_score += 1
-            if signals["rsi_overbought"]:
-                short_score += 1
-
-        # 3. ADX trend + directional movement (+DI/-DI)
-        if signals["trending"]:
-            if signals["trend_bullish"]:
-                long_score += 1
-            elif signals["trend_bearish"]:
-                short_score += 1
-
-        # 4. AI directional bias (Perplexity)
+        # === SCORING SYSTEM v7: 8+ sources, one bit per rule ===
+        # AI directional bias (Perplexity)
         ai_result = self.get_ai_bias(asset)
         ai_bias = ai_result["bias"]
-        if ai_bias == "LONG":
-            long_score += 1
-        elif ai_bias == "SHORT":
-            short_score += 1
-
-        # 5. Momentum (price vs SMA5)
-        if signals["momentum_bullish"]:
-            long_score += 1
-        elif signals["momentum_bearish"]:
-            short_score += 1
-
-        # 6. Liquidity zone bias
-        if liq_zones:
-            if liq_zones["liquidity_bias"] == "LONG":
-                long_score += 1
-            elif liq_zones["liquidity_bias"] == "SHORT":
-                short_score += 1
+        liq_bias = liq_zones["liquidity_bias"] if liq_zones else None
 
-        # 7. Orderbook imbalance (from v5)
+        # Orderbook imbalance (from v5)
         ob_ratio = self._get_orderbook_imbalance(asset)
         if ob_ratio is not None:
-            if ob_ratio > 1.5:
-                long_score += 1
-            elif ob_ratio < 0.67:
-                short_score += 1
             logger.info("%s orderbook bid/ask ratio: %.2f", asset, ob_ratio)
 
-        # 8. Multi-TF confirmation: RSI 1h + 4h (from v5)
-        if candles_1h:
-            if not signals_1h:
-                signals_1h = get_all_signals(candles_1h)
-            if signals_1h:
-                if signals_1h['rsi'] < 50:
-                    long_score += 1
-                elif signals_1h['rsi'] > 50:
-                    short_score += 1
-
-        candles_4h = self.get_candles_raw(asset, 50, interval="4h")
+        # Multi-TF confirmation: RSI 1h + 4h (from v5)
+        if candles_1h and not signals_1h:
+            signals_1h = get_all_signals(self._candle_array(asset, "1h", candles_1h))
+        rsi_1h = signals_1h["rsi"] if signals_1h else 50.0
+
+        signals_4h = None
+        candles_4h = self.get_candles_htf(asset, 50, "4h")
         if candles_4h:
-            signals_4h = get_all_signals(candles_4h)
-            if signals_4h:
-                if signals_4h['rsi'] < 50:
-                    long_score += 1
-                elif signals_4h['rsi'] > 50:
-                    short_score += 1
+            signals_4h = get_all_signals(self._candle_array(asset, "4h", candles_4h))
+        rsi_4h = signals_4h["rsi"] if signals_4h else 50.0
+
+        trending = signals["trending"]
+        long_mask = _pack_rules(
+            volume_confirmed and signals["below_lower_bb"],    # 1. BB (volume gated)
+            volume_confirmed and signals["rsi_oversold"],      # 2. RSI 35 (volume gated)
+            trending and signals["trend_bullish"],             # 3. ADX +DI
+            ai_bias == "LONG",                                 # 4. AI bias
+            signals["momentum_bullish"],                       # 5. price > SMA5
+            liq_bias == "LONG",                                # 6. liquidity zones
+            ob_ratio is not None and ob_ratio > 1.5,           # 7. orderbook
+            rsi_1h < 50,                                       # 8a. 1h RSI
+            rsi_4h < 50,                                       # 8b. 4h RSI
+        )
+        short_mask = _pack_rules(
+            volume_confirmed and signals["above_upper_bb"],
+            volume_confirmed and signals["rsi_overbought"],
+            trending and signals["trend_bearish"],
+            ai_bias == "SHORT",
+            signals["momentum_bearish"],
+            liq_bias == "SHORT",
+            ob_ratio is not None and ob_ratio < 0.67,
+            rsi_1h > 50,
+            rsi_4h > 50,
+        )
+        long_score = bin(long_mask).count("1")
+        short_score = bin(short_mask).count("1")
 
         if long_score > 0 or short_score > 0:
             logger.info(
-                "%s scores: LONG=%d SHORT=%d | AI=%s(%.2f) trend=%s mom=%s liq=%s ob=%s vol=%s",
-                asset, long_score, short_score,
+                "%s scores: LONG=%d(0x%03x) SHORT=%d(0x%03x) | AI=%s(%.2f) trend=%s mom=%s liq=%s ob=%s vol=%s",
+                asset, long_score, long_mask, short_score, short_mask,
                 ai_bias, ai_result["score"],
                 "BULL" if signals.get("trend_bullish") else "BEAR" if signals.get("trend_bearish") else "FLAT",
                 "UP" if signals["momentum_bullish"] else "DOWN",
-                liq_zones["liquidity_bias"] if liq_zones else "N/A",
+                liq_bias or "N/A",
                 "%.2f" % ob_ratio if ob_ratio is not None else "N/A",
                 "Y" if volume_confirmed else "N"
             )
@@ -445,6 +556,8 @@ class HyperliquidBot:
         signals["ob_ratio"] = ob_ratio
         signals["long_score"] = long_score
         signals["short_score"] = short_score
+        signals["long_mask"] = long_mask
+        signals["short_mask"] = short_mask
 
         if long_score >= long_thresh and long_score > short_score:
             logger.info("LONG SIGNAL on %s (score=%d, threshold=%d)", asset, long_score, long_thresh)
@@ -455,6 +568,45 @@ class HyperliquidBot:
 
         return None
 
+    def _prefetch_ai_bias(self, assets: List[str]):
+        """Refresh every stale cached_bias entry with batched Perplexity prompts
+        (get_combined_bias_many) so the scan's check_entry calls hit the cache"""
+        now_mono = time.monotonic()
+        max_age = config.SENTIMENT_CHECK_INTERVAL_MIN * 60
+        stale = {}  # ai asset (xyz: prefix stripped) -> bot assets sharing it
+        for asset in assets:
+            cached = self.cached_bias.get(asset)
+            if not cached or now_mono - cached["mono"] >= max_age:
+                stale.setdefault(asset.split(":")[-1], []).append(asset)
+        if not stale:
+            return
+        try:
+            results = self.sentiment_analyzer.get_combined_bias_many(list(stale))
+        except Exception as e:
+            logger.error("AI bias prefetch error: %s", e)
+            return  # get_ai_bias retries per asset
+        for ai_asset, result in results.items():
+            for asset in stale[ai_asset]:
+                self.cached_bias[asset] = {
+                    "bias": result["bias"],
+                    "score": result["score"],
+                    "mono": now_mono,
+                    "timestamp": datetime.now()
+                }
+
+    def _scan_entries(self, assets: List[str]) -> List[Optional[tuple]]:
+        """Run check_entry for every asset concurrently; results keep input order"""
+        self._prefetch_ai_bias(assets)
+        futures = [self._scan_pool.submit(self.check_entry, a) for a in assets]
+        results = []
+        for asset, fut in zip(assets, futures):
+            try:
+                results.append(fut.result())
+            except Exception as e:
+                logger.error("Entry check failed for %s: %s", asset, e)
+                results.append(None)
+        return results
+
     def round_size(self, asset: str, size: float) -> float:
         """Round size to asset szDecimals"""
         decimals = self.sz_decimals.get(asset, 2)
@@ -550,6 +702,7 @@ class HyperliquidBot:
         try:
             result = self.exchange.market_open(asset, is_buy, size)
             logger.info("Order result: %s", result)
+            self._invalidate_user_state()
 
             order_ok = False
             if result.get("status") == "ok":
@@ -582,22 +735,21 @@ class HyperliquidBot:
                 direction, size, asset, price, notional, lev
             )
 
-            # Telegram notification
+            # Telegram notification (returns at once; sent on the notifier's thread)
             try:
                 score = (signals or {}).get("long_score", 0) or (signals or {}).get("short_score", 0)
                 telegram_notifier.notify_trade_open(asset, direction, size, price, lev, score, [])
-            except Exception:
-                pass
+            except Exception as e:
+                logger.error("Telegram trade_open error: %s", e)
 
             # Log for strategy_optimizer (macro)
             trade_id = self.optimizer.log_trade(asset, direction, price, size, notional)
             self.open_trade_ids[asset] = trade_id
 
-            # Log for trade_tracker (micro)
-            self.tracker.log_entry(
-                asset, direction, size, price,
-                signals or {}, lev
-            )
+            # Log for trade_tracker (micro) — synchronous, so the main loop's
+            # detect_closed_trades always sees it
+            with self._tracker_lock:
+                self.tracker.log_entry(asset, direction, size, price, signals or {}, lev)
 
             time.sleep(1)
 
@@ -647,6 +799,7 @@ class HyperliquidBot:
                     close_size = self.round_size(asset, close_size)
                     
                     result = self.exchange.market_close(asset, sz=close_size)
+                    self._invalidate_user_state()
                     logger.info(
                         "PARTIAL TP TRIGGERED on %s: closing %.0f%% (%.4f) at +%.2f%% profit",
                         asset, config.PARTIAL_TP_SIZE*100, close_size, pnl_pct*100
@@ -686,6 +839,7 @@ class HyperliquidBot:
                     )
                     try:
                         result = self.exchange.market_close(asset)
+                        self._invalidate_user_state()
                         logger.info("Trailing stop close %s: %s", asset, result)
                         alert_logger.warning(
                             "TRAILING STOP CLOSED %s: peak=%.2f%%, exit=%.2f%%",
@@ -694,15 +848,16 @@ class HyperliquidBot:
                         # Get current price for exit tracking
                         candles = self.get_candles_raw(asset, 1)
                         exit_px = float(candles[-1]['c']) if candles else entry_px
-                        self.tracker.log_exit(asset, exit_px, "trailing_stop")
+                        with self._tracker_lock:
+                            self.tracker.log_exit(asset, exit_px, "trailing_stop")
                         direction = "LONG" if size > 0 else "SHORT"
                         pnl_usd = unrealized_pnl
                         try:
                             telegram_notifier.notify_trade_close(
                                 asset, direction, entry_px, exit_px, pnl_usd, pnl_pct*100, "trailing_stop"
                             )
-                        except Exception:
-                            pass
+                        except Exception as e:
+                            logger.error("Telegram trade_close error: %s", e)
                     except Exception as e:
                         logger.error("Trailing stop close error for %s: %s", asset, e)
                         alert_logger.error("TRAILING STOP CLOSE ERROR %s: %s", asset, e)
@@ -739,34 +894,63 @@ class HyperliquidBot:
             elif self.paused and drawdown < config.MAX_DRAWDOWN_PCT * 0.5:
                 logger.info("Drawdown recovered — resuming trading")
                 self.paused = False
+                self._resume_event.set()
 
-    def track_closed_positions(self, current_positions: List[Dict]):
+    def _fetch_fills_by_coin(self) -> Dict[str, List[Dict]]:
+        """Fills since the last fetch, bucketed by coin (oldest first)"""
+        by_coin = defaultdict(list)
+        try:
+            fills = self.info.user_fills_by_time(config.ACCOUNT_ADDRESS, self._last_fill_ts)
+        except Exception as e:
+            logger.warning("Fills fetch failed: %s", e)
+            return by_coin
+        for f in sorted(fills, key=lambda f: f["time"]):
+            by_coin[f["coin"]].append(f)
+        if fills:
+            self._last_fill_ts = max(f["time"] for f in fills) + 1
+        return by_coin
+
+    def track_closed_positions(self, current_positions: List[Dict],
+                               fills_by_coin: Optional[Dict[str, List[Dict]]] = None):
         """Detect when positions close and log the result + reclaim xyz funds"""
-        current_coins = set(p["coin"] for p in current_positions)
+        current_coins = {p["coin"] for p in current_positions}
         previously_open = self.last_known_positions
+        # is_xyz_asset also catches xyz: coins not (or no longer) in ASSETS
+        xyz_open = any(config.is_xyz_asset(c) for c in current_coins)
 
         for coin in previously_open - current_coins:
-            if coin in self.open_trade_ids:
-                self.optimizer.close_trade(coin, 0, 0)
+            if self.open_trade_ids.pop(coin, None) is not None:
+                coin_fills = (fills_by_coin or {}).get(coin)
+                if coin_fills:
+                    exit_px = float(coin_fills[-1]["px"])
+                    pnl = sum(float(f.get("closedPnl", 0)) for f in coin_fills)
+                else:
+                    exit_px, pnl = 0, 0
+                self.optimizer.close_trade(coin, exit_px, pnl)
                 logger.info("Position %s CLOSED — logged for optimizer", coin)
-                del self.open_trade_ids[coin]
 
-            # If xyz position closed, transfer funds back to default dex
-            if config.is_xyz_asset(coin):
-                xyz_still_open = any(config.is_xyz_asset(c) for c in current_coins)
-                if not xyz_still_open:
-                    logger.info("No more xyz positions — transferring funds back")
-                    self._transfer_from_xyz(999)
+            # If the last xyz position closed, transfer funds back to default dex
+            if not xyz_open and config.is_xyz_asset(coin):
+                logger.info("No more xyz positions — transferring funds back")
+                self._transfer_from_xyz(999)
+                xyz_open = True  # Only transfer once per call
 
         self.last_known_positions = current_coins
 
+    def _status_log_level(self, num_positions: int) -> int:
+        """INFO when the status line is due (interval elapsed or position count changed), else DEBUG"""
+        now = time.monotonic()
+        if (now - self._last_status_log_mono >= config.STATUS_LOG_INTERVAL_SEC
+                or num_positions != self._last_status_positions):
+            self._last_status_log_mono = now
+            self._last_status_positions = num_positions
+            return logging.INFO
+        return logging.DEBUG
+
     def run_optimization(self):
         """Run strategy self-improvement if due (every 5 hours)"""
-        now = datetime.now()
-        if self.last_optimization:
-            hours_since = (now - self.last_optimization).total_seconds() / 3600
-            if hours_since < 5:
-                return
+        if time.monotonic() < self._next_optimize_monotonic:
+            return
 
         logger.info("Running strategy optimization...")
         current_config = {
@@ -782,7 +966,16 @@ class HyperliquidBot:
             regime = self.optimizer.state.get("current_regime", "unknown")
             logger.info("Regime: %s | Adjustments applied: %s", regime, adjustments.get("bias", "none"))
 
-        self.last_optimization = now
+        self._next_optimize_monotonic = time.monotonic() + OPTIMIZE_INTERVAL_SEC
+
+    def shutdown(self):
+        """Stop the SDK websocket thread (non-daemon) and the scan pool so the process can exit"""
+        if config.USE_WEBSOCKET:
+            try:
+                self.info.disconnect_websocket()
+            except Exception as e:
+                logger.warning("Websocket disconnect failed: %s", e)
+        self._scan_pool.shutdown(wait=False, cancel_futures=True)
 
     def run(self):
         self.setup_leverage()
@@ -805,82 +998,104 @@ class HyperliquidBot:
         logger.info("szDecimals: %s", sz_info)
         logger.info("Strategy: BB+RSI+ADX(DI)+Momentum+AI+LiqZones+Orderbook+MultiTF (8+ sources)")
         logger.info("Regime: %s | Macro optimization: every 5h | Micro adaptation: every 6h/20 trades", regime)
-        logger.info("AI cache: %dmin | Check: every %ds", config.SENTIMENT_CHECK_INTERVAL_MIN, config.CHECK_INTERVAL_SEC)
+        logger.info(
+            "AI cache: %dmin | Check: every %ds%s", config.SENTIMENT_CHECK_INTERVAL_MIN,
+            config.CHECK_INTERVAL_SEC, " or on websocket event" if config.USE_WEBSOCKET else ""
+        )
         logger.info("SL: %.1f%% | TP: %.1f%% | Max DD: %.0f%%", tier["sl_pct"]*100, tier["tp_pct"]*100, config.MAX_DRAWDOWN_PCT*100)
         logger.info("HIP-3 dexes: %s | Auto-transfer: enabled", config.PERP_DEXS)
         logger.info("=" * 60)
 
-        while True:
-            try:
-                self.check_drawdown()
-                self.manage_open_positions()
-
-                if self.paused:
-                    logger.info("Bot paused (drawdown limit). Waiting...")
-                    time.sleep(300)
-                    continue
-
-                # Periodic macro optimization (every 5h)
-                self.run_optimization()
-
-                open_positions = self.get_open_positions()
-                open_coins = [p["coin"] for p in open_positions]
-
-                # Track closed positions for optimizer + xyz fund recovery
-                self.track_closed_positions(open_positions)
-
-                # Detect closed trades for tracker (micro)
-                self.tracker.detect_closed_trades(
-                    self.info, config.ACCOUNT_ADDRESS, open_positions
-                )
+        try:
+            while True:
+                try:
+                    self._touch_heartbeat()
+                    # One user_state fetch per dex serves every balance/position read below
+                    self._invalidate_user_state()
+                    self.check_drawdown()
+                    self.manage_open_positions()
+
+                    if self.paused:
+                        logger.info("Bot paused (drawdown limit). Waiting (SIGUSR1 to re-check now)...")
+                        self._resume_event.wait(timeout=300)
+                        self._resume_event.clear()
+                        continue
 
-                # Periodic micro strategy adaptation
-                if self.adapter.should_adapt():
-                    self.adapter.adapt()
-                    logger.info(self.adapter.get_report())
+                    # Periodic macro optimization (every 5h)
+                    self.run_optimization()
+
+                    open_positions = self.get_open_positions()
+                    open_coins = [p["coin"] for p in open_positions]
+
+                    # One fills fetch per iteration, only when something closed;
+                    # shared by the optimizer (macro) and the tracker (micro)
+                    current_coins = set(open_coins)
+                    with self._tracker_lock:
+                        tracker_closed = self.tracker.has_closed_trades(open_positions)
+                    fills_by_coin = {}
+                    if tracker_closed or self.last_known_positions - current_coins:
+                        fills_by_coin = self._fetch_fills_by_coin()
+
+                    # Track closed positions for optimizer + xyz fund recovery
+                    self.track_closed_positions(open_positions, fills_by_coin)
+
+                    # Detect closed trades for tracker (micro)
+                    if tracker_closed:
+                        with self._tracker_lock:
+                            self.tracker.detect_closed_trades(
+                                self.info, config.ACCOUNT_ADDRESS, open_positions, fills_by_coin
+                            )
 
-                if len(open_positions) >= config.MAX_OPEN_POSITIONS:
-                    balance = self.get_account_value()
-                    logger.info(
-                        "Max positions (%d): %s | Balance: $%.2f",
-                        len(open_positions), ", ".join(open_coins), balance
-                    )
-                    time.sleep(config.CHECK_INTERVAL_SEC)
-                    continue
+                    # Periodic micro strategy adaptation
+                    if self.adapter.should_adapt():
+                        self.adapter.adapt()
+                        logger.info(self.adapter.get_report())
 
-                for asset in config.ASSETS:
-                    if asset in open_coins:
-                        continue
                     if len(open_positions) >= config.MAX_OPEN_POSITIONS:
-                        break
-                    # Check if asset blocked by adapter
-                    if self.adapter.is_asset_blocked(asset):
+                        balance = self.get_account_value()
+                        logger.log(
+                            self._status_log_level(len(open_positions)),
+                            "Max positions (%d): %s | Balance: $%.2f",
+                            len(open_positions), ", ".join(open_coins), balance
+                        )
+                        self._wait_for_tick()
                         continue
 
-                    entry_result = self.check_entry(asset)
-                    if entry_result:
-                        direction, signals_snapshot = entry_result
-                        self.place_trade(asset, direction, signals_snapshot)
-                        open_positions = self.get_open_positions()
-                        open_coins = [p["coin"] for p in open_positions]
+                    # Fan out the network-bound entry checks, then trade sequentially
+                    # so fills still respect MAX_OPEN_POSITIONS
+                    candidates = [
+                        a for a in config.ASSETS
+                        if a not in open_coins and not self.adapter.is_asset_blocked(a)
+                    ]
+                    for asset, entry_result in zip(candidates, self._scan_entries(candidates)):
+                        if len(open_positions) >= config.MAX_OPEN_POSITIONS:
+                            break
+                        if entry_result:
+                            direction, signals_snapshot = entry_result
+                            self.place_trade(asset, direction, signals_snapshot)
+                            open_positions = self.get_open_positions()
+                            open_coins = [p["coin"] for p in open_positions]
 
-                balance = self.get_account_value()
-                pnl = balance - self.initial_balance
-                progress = (balance / 110) * 100
-                logger.info(
-                    "Balance: $%.2f | PnL: $%+.2f | Positions: %d | Progress: %.1f%%/110$",
-                    balance, pnl, len(open_positions), progress
-                )
+                    balance = self.get_account_value()
+                    pnl = balance - self.initial_balance
+                    progress = (balance / 110) * 100
+                    logger.log(
+                        self._status_log_level(len(open_positions)),
+                        "Balance: $%.2f | PnL: $%+.2f | Positions: %d | Progress: %.1f%%/110$",
+                        balance, pnl, len(open_positions), progress
+                    )
 
-                time.sleep(config.CHECK_INTERVAL_SEC)
+                    self._wait_for_tick()
 
-            except KeyboardInterrupt:
-                logger.info("Bot stopped by user")
-                break
-            except Exception as e:
-                logger.error("Main loop error: %s", e)
-                alert_logger.error("MAIN LOOP ERROR: %s", e)
-                time.sleep(30)
+                except KeyboardInterrupt:
+                    logger.info("Bot stopped by user")
+                    break
+                except Exception as e:
+                    logger.error("Main loop error: %s", e)
+                    alert_logger.error("MAIN LOOP ERROR: %s", e)
+                    time.sleep(30)
+        finally:
+            self.shutdown()
 
 
 if __name__ == "__main__":
@@ -3,15 +3,26 @@
 import json
 import logging
 import os
+import threading
 import time
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from hexbytes import HexBytes
 from web3 import Web3
 from eth_account import Account
 
 import env_loader
 import farmer_config
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional speedup — stdlib json works the same, just slower
+    _json_loads = json.loads
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - [CHAIN] %(message)s',
@@ -22,6 +33,58 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# How long fetched fee data (base + priority fee) is reused before refetching
+GAS_CACHE_TTL_SEC = 3.0
+
+# How often wait_for_low_gas polls its block filter for new heads (~one block)
+BLOCK_FILTER_POLL_SEC = 2.0
+
+# send_transaction(wait_for_receipt=True): max wait and receipt poll interval
+RECEIPT_TIMEOUT_SEC = 20
+RECEIPT_POLL_SEC = 0.25
+
+# Per-RPC latency EMA: weight of each new sample, how often get_web3 re-ranks a
+# chain's endpoints, and the latency charged to an endpoint that failed
+RPC_LATENCY_ALPHA = 0.2
+RPC_REPROBE_SEC = 30.0
+RPC_FAILURE_PENALTY_MS = 10_000.0
+
+# Errors that mean the provider/connection is bad (vs. an RPC-level error)
+_CONNECTION_ERRORS = (ConnectionError, requests.ConnectionError, requests.Timeout, requests.HTTPError)
+
+# Broadcast errors (lowercased substrings): the node definitely refused the tx, so
+# its nonce was not consumed; vs. the node already holds this exact tx
+_TX_REJECTED = ("nonce too low", "nonce too high", "underpriced", "replacement transaction",
+                "insufficient funds", "intrinsic gas too low", "exceeds block gas limit")
+_TX_ALREADY_KNOWN = ("already known", "known transaction", "already imported")
+
+# eth_sendRawTransactionSync: error codes / messages RPCs use for "method not
+# available" (fall back to eth_sendRawTransaction), and the method's own
+# timeout error (tx accepted, not yet included)
+_UNSUPPORTED_METHOD_CODES = (-32601, -32600, -32602)
+_UNSUPPORTED_METHOD_MSGS = ("not supported", "unsupported", "not found", "does not exist",
+                            "not available", "unknown method", "not allowed")
+_SYNC_SEND_TIMEOUT_CODE = 4
+
+
+class _FastHTTPProvider(Web3.HTTPProvider):
+    """HTTPProvider that decodes RPC responses with orjson when available
+    and reports each successful request's latency to `on_latency(url, ms)`."""
+
+    def __init__(self, *args, on_latency: Optional[Callable[[str, float], None]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_latency = on_latency
+
+    def make_request(self, method, params):
+        start = time.perf_counter()
+        response = super().make_request(method, params)
+        if self._on_latency:
+            self._on_latency(self.endpoint_uri, (time.perf_counter() - start) * 1000)
+        return response
+
+    def decode_rpc_response(self, raw_response: bytes):
+        return _json_loads(raw_response)
+
 
 class BudgetTracker:
     """Tracks gas spending per chain against a total USD budget."""
@@ -32,20 +95,21 @@ class BudgetTracker:
         self.reserve_pct = reserve_pct
         self.spent_by_chain: Dict[str, float] = {}
         self.total_spent = 0.0
+        self._chains = farmer_config.CHAINS
 
     def record_spend(self, chain: str, amount_usd: float):
         self.spent_by_chain[chain] = self.spent_by_chain.get(chain, 0.0) + amount_usd
         self.total_spent += amount_usd
         remaining = self.get_remaining()
         if remaining < self.budget_usd * 0.20:
-            logger.warning(f"Budget low: ${remaining:.4f} remaining (${self.total_spent:.4f} spent)")
+            logger.warning("Budget low: $%.4f remaining ($%.4f spent)", remaining, self.total_spent)
 
     def get_remaining(self) -> float:
         usable = self.budget_usd * (1.0 - self.reserve_pct)
         return max(0.0, usable - self.total_spent)
 
     def can_afford(self, chain: str) -> bool:
-        cfg = farmer_config.CHAINS.get(chain)
+        cfg = self._chains.get(chain)
         if not cfg:
             return False
         return self.get_remaining() >= cfg["avg_gas_cost"]
@@ -69,23 +133,86 @@ class BudgetTracker:
         return tracker
 
 
+class NonceManager:
+    """Local nonce counters per (chain, address), seeded once from the node's pending count."""
+
+    def __init__(self, fetch: Callable[[str, str], int]):
+        self._fetch = fetch  # (chain, address) -> pending tx count
+        self._next: Dict[Tuple[str, str], int] = {}
+        self._locks: Dict[Tuple[str, str], threading.RLock] = {}
+        self._guard = threading.Lock()
+
+    def lock(self, chain: str, address: str) -> threading.RLock:
+        """Per-wallet lock; hold it across allocation + send to keep sends ordered."""
+        key = (chain, address)
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.RLock()
+            return lock
+
+    def next_nonce(self, chain: str, address: str) -> int:
+        key = (chain, address)
+        with self.lock(chain, address):
+            nonce = self._next.get(key)
+            if nonce is None:
+                nonce = self._fetch(chain, address)
+            self._next[key] = nonce + 1
+            return nonce
+
+    def seed(self, chain: str, address: str, pending_count: int):
+        """Use an already-fetched pending count if no counter exists yet."""
+        with self.lock(chain, address):
+            self._next.setdefault((chain, address), pending_count)
+
+    def reset(self, chain: str, address: str):
+        """Drop the counter so the next allocation resyncs from the node."""
+        with self.lock(chain, address):
+            self._next.pop((chain, address), None)
+
+
 class ChainManager:
     """Manages connections, gas, and transactions across multiple chains."""
 
     def __init__(self):
+        self._chains = farmer_config.CHAINS
         self.wallets = self._load_wallets()
         self.budget = BudgetTracker()
         self._web3_cache: Dict[str, Web3] = {}
-        logger.info(f"ChainManager initialized — {len(self.wallets)} wallets, "
-                     f"{len(farmer_config.CHAINS)} chains")
+        self._rpc_urls: Dict[str, str] = {}
+        # rpc_url -> Web3 (kept across switches), rpc_url -> latency EMA in ms,
+        # chain -> monotonic time after which get_web3 re-ranks its endpoints
+        self._providers: Dict[str, Web3] = {}
+        self._rpc_latency: Dict[str, float] = {}
+        self._reprobe_at: Dict[str, float] = {}
+        # chain -> (monotonic_ts, base_fee_wei, priority_fee_wei)
+        self._gas_cache: Dict[str, Tuple[float, int, int]] = {}
+        # One keep-alive session shared by every provider and raw JSON-RPC batch
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=32, pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.1),
+        ))
+        self.nonces = NonceManager(
+            lambda chain, address: self._run(
+                chain, lambda w3: w3.eth.get_transaction_count(address, "pending"))
+        )
+        # chain -> whether the RPC supports eth_sendRawTransactionSync (probed on first use)
+        self._sync_send: Dict[str, bool] = {}
+        # Per-chain fee setters, resolved once so send_transaction skips the config lookups
+        self._fee_builders: Dict[str, Callable[[Web3, dict], None]] = {
+            name: self._make_fee_builder(name, cfg) for name, cfg in self._chains.items()
+        }
+        logger.info("ChainManager initialized — %d wallets, %d chains",
+                    len(self.wallets), len(self._chains))
 
     def _load_wallets(self) -> list:
         """Load wallets from JSON file or env var fallback."""
         wallets_path = farmer_config.WALLETS_FILE
         if os.path.exists(wallets_path):
-            with open(wallets_path, 'r') as f:
-                wallets = json.load(f)
-            logger.info(f"Loaded {len(wallets)} wallets from {wallets_path}")
+            with open(wallets_path, 'rb') as f:
+                wallets = _json_loads(f.read())
+            logger.info("Loaded %d wallets from %s", len(wallets), wallets_path)
             return wallets
 
         # Fallback: single wallet from env var
@@ -99,135 +226,402 @@ class ChainManager:
         logger.warning("No wallets found — create farming_wallets.json or set FARMING_WALLET_KEY")
         return []
 
+    def _record_latency(self, rpc_url: Optional[str], ms: float):
+        if rpc_url is None:
+            return
+        prev = self._rpc_latency.get(rpc_url)
+        self._rpc_latency[rpc_url] = ms if prev is None else prev + RPC_LATENCY_ALPHA * (ms - prev)
+
     def get_web3(self, chain_name: str) -> Optional[Web3]:
-        """Return a connected Web3 instance with RPC failover."""
-        if chain_name in self._web3_cache:
-            w3 = self._web3_cache[chain_name]
-            if w3.is_connected():
-                return w3
-            del self._web3_cache[chain_name]
-
-        cfg = farmer_config.CHAINS.get(chain_name)
+        """Return a connected Web3 instance bound to the chain's fastest RPC."""
+        # Warm cache is trusted between re-ranks; dead providers are dropped lazily by _run()
+        now = time.monotonic()
+        w3 = self._web3_cache.get(chain_name)
+        if w3 is not None and now < self._reprobe_at.get(chain_name, 0.0):
+            return w3
+
+        cfg = self._chains.get(chain_name)
         if not cfg:
-            logger.error(f"Unknown chain: {chain_name}")
+            logger.error("Unknown chain: %s", chain_name)
             return None
 
-        for rpc_url in cfg["rpcs"]:
+        # Lowest latency EMA first; endpoints never measured rank first so each gets sampled
+        for rpc_url in sorted(cfg["rpcs"], key=lambda url: self._rpc_latency.get(url, 0.0)):
+            w3 = self._providers.get(rpc_url)
+            if w3 is None:
+                try:
+                    w3 = Web3(_FastHTTPProvider(rpc_url, session=self._session,
+                                                request_kwargs={"timeout": 10},
+                                                on_latency=self._record_latency))
+                    if not w3.is_connected():
+                        self._record_latency(rpc_url, RPC_FAILURE_PENALTY_MS)
+                        continue
+                except Exception as e:
+                    logger.warning("RPC failed %s (%s): %.80s", chain_name, rpc_url, e)
+                    self._record_latency(rpc_url, RPC_FAILURE_PENALTY_MS)
+                    continue
+                self._providers[rpc_url] = w3
+            if self._rpc_urls.get(chain_name) != rpc_url:
+                logger.info("Connected to %s via %s (%.0f ms)", chain_name, rpc_url,
+                            self._rpc_latency.get(rpc_url, 0.0))
+            self._web3_cache[chain_name] = w3
+            self._rpc_urls[chain_name] = rpc_url
+            self._reprobe_at[chain_name] = now + RPC_REPROBE_SEC
+            return w3
+
+        logger.error("All RPCs failed for %s", chain_name)
+        return None
+
+    def _run(self, chain_name: str, op: Callable[[Web3], Any]) -> Any:
+        """Run op(w3) on the cached provider; on a connection error reconnect and retry once.
+
+        Only for idempotent ops (reads) — a failed request may still have reached
+        the node. Broadcasts go through _broadcast, which never re-signs.
+        """
+        w3 = self.get_web3(chain_name)
+        if not w3:
+            raise ConnectionError(f"No RPC available for {chain_name}")
+        try:
+            return op(w3)
+        except _CONNECTION_ERRORS as e:
+            logger.warning("RPC connection lost on %s (%.60s), reconnecting", chain_name, e)
+            self._record_latency(self._rpc_urls.get(chain_name), RPC_FAILURE_PENALTY_MS)
+            self._web3_cache.pop(chain_name, None)
+            w3 = self.get_web3(chain_name)
+            if not w3:
+                raise
+            return op(w3)
+
+    def batch_call(self, chain_name: str, calls: List[Tuple[str, list]]) -> list:
+        """Send several JSON-RPC calls in one HTTP round-trip.
+
+        Returns results in the order of `calls` (None for calls that errored).
+        Raises if the RPC rejects batching so callers can fall back.
+        """
+        if not self.get_web3(chain_name):
+            raise ConnectionError(f"No RPC available for {chain_name}")
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        rpc_url = self._rpc_urls[chain_name]
+        start = time.perf_counter()
+        resp = self._session.post(rpc_url, json=payload, timeout=10)
+        resp.raise_for_status()
+        self._record_latency(rpc_url, (time.perf_counter() - start) * 1000)
+        data = _json_loads(resp.content)
+        if not isinstance(data, list):
+            raise ValueError(f"JSON-RPC batch not supported: {str(data)[:80]}")
+        by_id = {item.get("id"): item.get("result") for item in data}
+        return [by_id.get(i) for i in range(len(calls))]
+
+    def _fetch_fee_params(self, chain_name: str, w3: Web3) -> Tuple[int, int]:
+        """Return (base_fee_wei, priority_fee_wei) — one batched round-trip when possible."""
+        try:
+            latest, priority = self.batch_call(chain_name, [
+                ("eth_getBlockByNumber", ["latest", False]),
+                ("eth_maxPriorityFeePerGas", []),
+            ])
+            base_fee = int(latest.get("baseFeePerGas", "0x0"), 16)
+            priority_fee = int(priority, 16) if priority else Web3.to_wei(1, "gwei")
+            return base_fee, priority_fee
+        except Exception:
+            pass
+
+        latest = w3.eth.get_block("latest")
+        base_fee = latest.get("baseFeePerGas", 0)
+        # Priority fee: use eth_maxPriorityFeePerGas if available
+        try:
+            priority_fee = w3.eth.max_priority_fee
+        except Exception:
+            priority_fee = Web3.to_wei(1, "gwei")
+        return base_fee, priority_fee
+
+    def _get_fee_params(self, chain_name: str, w3: Web3, ttl: float = GAS_CACHE_TTL_SEC) -> Tuple[int, int]:
+        """Cached (base_fee_wei, priority_fee_wei); refetched once older than `ttl` seconds."""
+        now = time.monotonic()
+        cached = self._gas_cache.get(chain_name)
+        if cached and now - cached[0] < ttl:
+            return cached[1], cached[2]
+        base_fee, priority_fee = self._fetch_fee_params(chain_name, w3)
+        self._gas_cache[chain_name] = (now, base_fee, priority_fee)
+        return base_fee, priority_fee
+
+    def _broadcast(self, chain_name: str, signed, wait: bool,
+                   nonce_owner: Optional[str]) -> Tuple[HexBytes, Optional[dict]]:
+        """Broadcast an already-signed tx. Returns (tx_hash, receipt or None) like _send_raw.
+
+        A transport error doesn't tell us whether the node got the tx, so the
+        same raw bytes (same nonce, same hash) are resent once on a fresh
+        provider — at most one of the two can ever be mined. nonce_owner's local
+        counter is reset only when the node definitely rejected the tx.
+        """
+        for attempt in range(2):
+            w3 = self.get_web3(chain_name)
+            if not w3:
+                raise ConnectionError(f"No RPC available for {chain_name}")
             try:
-                w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": 10}))
-                if w3.is_connected():
-                    self._web3_cache[chain_name] = w3
-                    logger.info(f"Connected to {chain_name} via {rpc_url}")
-                    return w3
+                return self._send_raw(chain_name, w3, signed, wait)
+            except _CONNECTION_ERRORS as e:
+                if attempt:
+                    raise  # may or may not be in the mempool: keep the nonce counted
+                logger.warning("Broadcast on %s failed (%.60s), resending the same tx", chain_name, e)
+                self._record_latency(self._rpc_urls.get(chain_name), RPC_FAILURE_PENALTY_MS)
+                self._web3_cache.pop(chain_name, None)
             except Exception as e:
-                logger.warning(f"RPC failed {chain_name} ({rpc_url}): {str(e)[:80]}")
-
-        logger.error(f"All RPCs failed for {chain_name}")
-        return None
+                msg = str(e).lower()
+                # On the resend, "nonce too low" also means our first send got through
+                if any(m in msg for m in _TX_ALREADY_KNOWN) or (attempt and "nonce too low" in msg):
+                    return HexBytes(signed.hash), None
+                if nonce_owner and any(m in msg for m in _TX_REJECTED):
+                    self.nonces.reset(chain_name, nonce_owner)
+                raise
+
+    def _send_raw(self, chain_name: str, w3: Web3, signed, wait: bool) -> Tuple[HexBytes, Optional[dict]]:
+        """Broadcast a signed tx. Returns (tx_hash, receipt), receipt None unless already mined.
+
+        With wait=True, uses eth_sendRawTransactionSync where the RPC supports
+        it, so the call returns once the tx is included. If the sync call
+        times out (HTTP read timeout or the method's own timeout error) the tx
+        was already accepted: return it as sent-but-unmined so the caller
+        waits for its receipt. Any "unsupported method"-style error falls back
+        to a plain eth_sendRawTransaction.
+        """
+        if wait and self._sync_send.get(chain_name, True):
+            try:
+                resp = w3.provider.make_request("eth_sendRawTransactionSync", [Web3.to_hex(signed.raw_transaction)])
+            except requests.ReadTimeout:
+                logger.debug("eth_sendRawTransactionSync on %s timed out, waiting for receipt", chain_name)
+                return HexBytes(signed.hash), None
+            error = resp.get("error")
+            if not error:
+                self._sync_send[chain_name] = True
+                receipt = resp["result"]
+                if isinstance(receipt, dict):
+                    return HexBytes(receipt["transactionHash"]), receipt
+                return HexBytes(signed.hash), None  # some nodes answer with just the hash
+            code = error.get("code")
+            message = str(error.get("message", "")).lower()
+            if code == _SYNC_SEND_TIMEOUT_CODE or "timeout" in message or "timed out" in message:
+                return HexBytes(signed.hash), None
+            if code not in _UNSUPPORTED_METHOD_CODES and not any(m in message for m in _UNSUPPORTED_METHOD_MSGS):
+                raise ValueError(error)
+            logger.debug("eth_sendRawTransactionSync not supported on %s (%s)", chain_name, error)
+            self._sync_send[chain_name] = False
+        return w3.eth.send_raw_transaction(signed.raw_transaction), None
+
+    def _make_fee_builder(self, chain_name: str, cfg: dict) -> Callable[[Web3, dict], None]:
+        """Return a function that fills the fee fields of a tx dict for this chain."""
+        if cfg.get("eip1559"):
+            def _eip1559(w3: Web3, tx: dict):
+                base_fee, priority_fee = self._get_fee_params(chain_name, w3)
+                tx["maxFeePerGas"] = base_fee * 2 + priority_fee
+                tx["maxPriorityFeePerGas"] = priority_fee
+            return _eip1559
+
+        def _legacy(w3: Web3, tx: dict):
+            tx["gasPrice"] = w3.eth.gas_price
+        return _legacy
+
+    def next_nonce(self, chain_name: str, address: str) -> int:
+        """Next nonce for address on chain — one RPC on first use, then counted locally."""
+        return self.nonces.next_nonce(chain_name, address)
 
     def estimate_gas(self, chain_name: str) -> Optional[float]:
         """Return current gas price in gwei. Uses EIP-1559 if supported."""
-        w3 = self.get_web3(chain_name)
-        if not w3:
+        cfg = self._chains.get(chain_name)
+        if not cfg:
+            logger.error("Unknown chain: %s", chain_name)
             return None
 
-        cfg = farmer_config.CHAINS[chain_name]
-        try:
+        def _total_wei(w3: Web3) -> int:
             if cfg.get("eip1559"):
-                latest = w3.eth.get_block("latest")
-                base_fee = latest.get("baseFeePerGas", 0)
-                # Priority fee: use eth_maxPriorityFeePerGas if available
-                try:
-                    priority_fee = w3.eth.max_priority_fee
-                except Exception:
-                    priority_fee = Web3.to_wei(1, "gwei")
-                total_wei = base_fee + priority_fee
-            else:
-                total_wei = w3.eth.gas_price
+                base_fee, priority_fee = self._get_fee_params(chain_name, w3)
+                return base_fee + priority_fee
+            return w3.eth.gas_price
 
-            return float(Web3.from_wei(total_wei, "gwei"))
+        try:
+            return float(Web3.from_wei(self._run(chain_name, _total_wei), "gwei"))
         except Exception as e:
-            logger.warning(f"Gas estimation failed for {chain_name}: {str(e)[:80]}")
+            logger.warning("Gas estimation failed for %s: %.80s", chain_name, e)
             return None
 
     def wait_for_low_gas(self, chain_name: str, max_gwei: float, poll_interval: int = 30,
                          timeout: int = 3600):
-        """Block until gas drops below max_gwei or timeout is reached."""
-        start = time.time()
-        while time.time() - start < timeout:
+        """Block until gas drops below max_gwei or timeout is reached.
+
+        EIP-1559 chains re-check on every new block via an eth_newBlockFilter;
+        other chains (or RPCs without filter support) poll every poll_interval.
+        """
+        deadline = time.monotonic() + timeout
+        cfg = self._chains.get(chain_name)
+        if cfg and cfg.get("eip1559"):
+            result = self._wait_for_low_gas_on_heads(chain_name, max_gwei, poll_interval, deadline)
+            if result is not None:
+                return result
+
+        while time.monotonic() < deadline:
             gas = self.estimate_gas(chain_name)
             if gas is not None and gas <= max_gwei:
-                logger.info(f"Gas OK on {chain_name}: {gas:.2f} gwei (<= {max_gwei})")
+                logger.info("Gas OK on %s: %.2f gwei (<= %s)", chain_name, gas, max_gwei)
                 return True
             if gas is not None:
-                logger.info(f"Gas too high on {chain_name}: {gas:.2f} gwei (waiting for <= {max_gwei})")
+                logger.info("Gas too high on %s: %.2f gwei (waiting for <= %s)", chain_name, gas, max_gwei)
             time.sleep(poll_interval)
 
-        logger.warning(f"Gas wait timeout on {chain_name} after {timeout}s")
+        logger.warning("Gas wait timeout on %s after %ss", chain_name, timeout)
         return False
 
-    def get_balance(self, chain_name: str, address: str) -> Optional[float]:
-        """Return native balance in ETH."""
+    def _wait_for_low_gas_on_heads(self, chain_name: str, max_gwei: float,
+                                   poll_interval: float, deadline: float) -> Optional[bool]:
+        """Re-evaluate gas on each new block head until deadline.
+
+        The filter is polled every BLOCK_FILTER_POLL_SEC; an empty poll is the
+        only RPC between blocks. On a new head, baseFeePerGas comes from that
+        block and the priority fee (which moves slowly) is reused from the
+        fee cache for up to poll_interval.
+
+        Returns True/False like wait_for_low_gas, or None if the RPC can't
+        serve block filters (caller falls back to polling).
+        """
         w3 = self.get_web3(chain_name)
         if not w3:
             return None
+        try:
+            block_filter = w3.eth.filter("latest")
+        except Exception as e:
+            logger.debug("Block filter unavailable on %s (%.60s), polling instead", chain_name, e)
+            return None
 
         try:
-            balance_wei = w3.eth.get_balance(Web3.to_checksum_address(address))
+            while time.monotonic() < deadline:
+                new_heads = block_filter.get_new_entries()
+                if new_heads:
+                    head = w3.eth.get_block(new_heads[-1])
+                    _, priority_fee = self._get_fee_params(chain_name, w3, ttl=poll_interval)
+                    gas = float(Web3.from_wei(head.get("baseFeePerGas", 0) + priority_fee, "gwei"))
+                    if gas <= max_gwei:
+                        logger.info("Gas OK on %s: %.2f gwei (<= %s)", chain_name, gas, max_gwei)
+                        return True
+                    logger.debug("Gas too high on %s: %.2f gwei at block %s",
+                                 chain_name, gas, head.get("number"))
+                time.sleep(BLOCK_FILTER_POLL_SEC)
+        except Exception as e:
+            # Load-balanced public RPCs often drop filters between backends
+            logger.debug("Block filter lost on %s (%.60s), polling instead", chain_name, e)
+            return None
+        finally:
+            try:
+                w3.eth.uninstall_filter(block_filter.filter_id)
+            except Exception:
+                pass
+
+        logger.warning("Gas wait timeout on %s", chain_name)
+        return False
+
+    def get_balance(self, chain_name: str, address: str) -> Optional[float]:
+        """Return native balance in ETH."""
+        checksum = Web3.to_checksum_address(address)
+        try:
+            balance_wei = self._run(chain_name, lambda w3: w3.eth.get_balance(checksum))
             return float(Web3.from_wei(balance_wei, "ether"))
         except Exception as e:
-            logger.warning(f"Balance check failed {chain_name}/{address[:10]}: {str(e)[:80]}")
+            logger.warning("Balance check failed %s/%.10s: %.80s", chain_name, address, e)
             return None
 
+    def _wait_for_receipt(self, chain_name: str, tx_hash):
+        """Block until tx_hash is mined; returns the receipt, or None (logged) on timeout."""
+        try:
+            return self.get_web3(chain_name).eth.wait_for_transaction_receipt(
+                tx_hash, timeout=RECEIPT_TIMEOUT_SEC, poll_latency=RECEIPT_POLL_SEC
+            )
+        except Exception as e:
+            logger.warning("No receipt on %s for %.20s... after %ss: %.60s",
+                           chain_name, tx_hash.hex(), RECEIPT_TIMEOUT_SEC, e)
+            return None
+
+    def get_balances(self, chain_name: str, addresses: List[str]) -> Dict[str, Optional[float]]:
+        """Return native balances in ETH for many addresses — one batched round-trip when possible."""
+        if not addresses:
+            return {}
+        try:
+            results = self.batch_call(chain_name, [
+                ("eth_getBalance", [Web3.to_checksum_address(a), "latest"]) for a in addresses
+            ])
+        except Exception as e:
+            logger.debug("Balance batch failed on %s (%.60s), querying one by one", chain_name, e)
+            results = [None] * len(addresses)
+
+        balances = {}
+        for address, raw in zip(addresses, results):
+            if raw is None:
+                balances[address] = self.get_balance(chain_name, address)
+            else:
+                balances[address] = float(Web3.from_wei(int(raw, 16), "ether"))
+        return balances
+
     def get_gas_cost_usd(self, chain_name: str) -> float:
         """Return estimated cost of a standard tx in USD from config."""
-        cfg = farmer_config.CHAINS.get(chain_name)
+        cfg = self._chains.get(chain_name)
         if not cfg:
             return 0.0
         return cfg["avg_gas_cost"]
 
-    def send_transaction(self, chain_name: str, tx_dict: dict, private_key: str) -> Optional[str]:
-        """Sign, send a transaction, and record gas spend. Returns tx hash hex."""
-        w3 = self.get_web3(chain_name)
-        if not w3:
-            return None
+    def send_transaction(self, chain_name: str, tx_dict: dict, private_key: str,
+                         wait_for_receipt: bool = False) -> Optional[str]:
+        """Sign, send a transaction, and record gas spend. Returns tx hash hex.
 
-        cfg = farmer_config.CHAINS[chain_name]
+        wait_for_receipt=True blocks until the tx is mined, for callers whose next
+        tx depends on this one; it then returns the hash only if the receipt has
+        status 1, and None if the tx reverted or wasn't mined within
+        RECEIPT_TIMEOUT_SEC.
+        """
+        cfg = self._chains.get(chain_name)
+        if not cfg:
+            logger.error("Unknown chain: %s", chain_name)
+            return None
 
         # Ensure chain_id is set
         tx_dict.setdefault("chainId", cfg["chain_id"])
-
-        # Set gas price if not already set
-        if "gasPrice" not in tx_dict and "maxFeePerGas" not in tx_dict:
-            if cfg.get("eip1559"):
-                latest = w3.eth.get_block("latest")
-                base_fee = latest.get("baseFeePerGas", 0)
-                try:
-                    priority_fee = w3.eth.max_priority_fee
-                except Exception:
-                    priority_fee = Web3.to_wei(1, "gwei")
-                tx_dict["maxFeePerGas"] = base_fee * 2 + priority_fee
-                tx_dict["maxPriorityFeePerGas"] = priority_fee
-            else:
-                tx_dict["gasPrice"] = w3.eth.gas_price
-
-        # Set nonce if not provided
-        if "nonce" not in tx_dict:
-            acct = Account.from_key(private_key)
-            tx_dict["nonce"] = w3.eth.get_transaction_count(acct.address)
+        build_fees = self._fee_builders[chain_name]
+        manage_nonce = "nonce" not in tx_dict
 
         try:
-            signed = w3.eth.account.sign_transaction(tx_dict, private_key)
-            tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
+            # Fee lookups are reads, safe to retry; the tx is then signed exactly once
+            if "gasPrice" not in tx_dict and "maxFeePerGas" not in tx_dict:
+                self._run(chain_name, lambda w3: build_fees(w3, tx_dict))
+
+            if manage_nonce:
+                # Allocate locally; the lock keeps this wallet's sends in nonce order
+                address = Account.from_key(private_key).address
+                with self.nonces.lock(chain_name, address):
+                    tx_dict["nonce"] = self.nonces.next_nonce(chain_name, address)
+                    try:
+                        signed = Account.sign_transaction(tx_dict, private_key)
+                    except Exception:
+                        self.nonces.reset(chain_name, address)  # never left this process
+                        raise
+                    tx_hash, receipt = self._broadcast(chain_name, signed, wait_for_receipt, address)
+            else:
+                # Caller-supplied nonce (e.g. from next_nonce) may be stale
+                signed = Account.sign_transaction(tx_dict, private_key)
+                tx_hash, receipt = self._broadcast(chain_name, signed, wait_for_receipt, tx_dict.get("from"))
             tx_hex = tx_hash.hex()
+            if wait_for_receipt and receipt is None:
+                receipt = self._wait_for_receipt(chain_name, tx_hash)
 
             # Record gas spend
             gas_cost = self.get_gas_cost_usd(chain_name)
             self.budget.record_spend(chain_name, gas_cost)
 
-            logger.info(f"TX sent on {chain_name}: {tx_hex[:20]}... "
-                        f"(gas ~${gas_cost:.4f}, remaining ${self.budget.get_remaining():.4f})")
+            logger.info("TX sent on %s: %.20s... (gas ~$%.4f, remaining $%.4f)",
+                        chain_name, tx_hex, gas_cost, self.budget.get_remaining())
+
+            if wait_for_receipt and (receipt is None or receipt.get("status") != 1):
+                if receipt is not None:
+                    logger.warning("TX reverted on %s: %.20s...", chain_name, tx_hex)
+                return None
             return tx_hex
         except Exception as e:
-            logger.error(f"TX failed on {chain_name}: {str(e)[:120]}")
+            logger.error("TX failed on %s: %.120s", chain_name, e)
             return None
@@ -4,26 +4,64 @@ from hyperliquid.info import Info
 from hyperliquid.utils import constants
 from eth_account import Account
 import config
+import http_pool
+
+BATCH_SIZE = 50  # Max actions per signed request
+SLIPPAGE = 0.05  # Same default as Exchange.market_close
 
 account = Account.from_key(config.API_SECRET)
-info = Info(constants.MAINNET_API_URL, skip_ws=True)
-exchange = Exchange(account, constants.MAINNET_API_URL, account_address=config.ACCOUNT_ADDRESS)
+# Multi-dex like bot.py: default perps + xyz HIP-3
+info = Info(constants.MAINNET_API_URL, skip_ws=True, perp_dexs=config.PERP_DEXS)
+exchange = Exchange(account, constants.MAINNET_API_URL, account_address=config.ACCOUNT_ADDRESS,
+                    perp_dexs=config.PERP_DEXS)
+http_pool.share_session(info, exchange)
+
+
+def _chunks(items, n=BATCH_SIZE):
+    for i in range(0, len(items), n):
+        yield items[i:i + n]
 
-# Cancel all open orders first
-open_orders = info.open_orders(config.ACCOUNT_ADDRESS)
+
+# Cancel all open orders first (both dexes) — one signed request per batch
+open_orders = [o for dex in config.PERP_DEXS for o in info.open_orders(config.ACCOUNT_ADDRESS, dex=dex)]
 for order in open_orders:
     print(f"Cancelling order {order['oid']} on {order['coin']}")
-    exchange.cancel(order['coin'], order['oid'])
+for batch in _chunks([{"coin": o['coin'], "oid": o['oid']} for o in open_orders]):
+    exchange.bulk_cancel(batch)
 
-# Close all positions
-state = info.user_state(config.ACCOUNT_ADDRESS)
-for pos in state.get('assetPositions', []):
+# Close all positions — size decimals and mids fetched once per dex up front
+sz_decimals = {}
+mids = {}
+positions = []
+for dex in config.PERP_DEXS:
+    sz_decimals.update((a['name'], a['szDecimals']) for a in info.meta(dex=dex)['universe'])
+    mids.update(info.all_mids(dex=dex))
+    positions += info.user_state(config.ACCOUNT_ADDRESS, dex=dex).get('assetPositions', [])
+
+closes = []
+for pos in positions:
     p = pos['position']
     size = float(p['szi'])
     if abs(size) > 0:
         coin = p['coin']
+        if coin not in mids:
+            # Skip just this one; the rest of the emergency close still goes out
+            print(f"WARNING: no mid price for {coin}, close {size} manually")
+            continue
+        is_buy = size < 0
+        px = float(mids[coin]) * (1 + SLIPPAGE if is_buy else 1 - SLIPPAGE)
+        px = round(float(f"{px:.5g}"), 6 - sz_decimals.get(coin, 0))
         print(f"Closing {coin}: {size}")
-        exchange.market_close(coin)
+        closes.append({
+            "coin": coin,
+            "is_buy": is_buy,
+            "sz": abs(size),
+            "limit_px": px,
+            "order_type": {"limit": {"tif": "Ioc"}},
+            "reduce_only": True,
+        })
+for batch in _chunks(closes):
+    exchange.bulk_orders(batch)
 
 # Final state
 state = info.user_state(config.ACCOUNT_ADDRESS)
@@ -48,7 +48,11 @@ CANDLE_DURATION_MS = 15 * 60 * 1000
 LOOKBACK_CANDLES = 100
 
 # Bot timing
-CHECK_INTERVAL_SEC = 45  # Check every 45 seconds
+CHECK_INTERVAL_SEC = 45  # Check every 45 seconds (max wait when event-driven)
+SCAN_WORKERS = 9  # Concurrent per-asset entry checks
+USE_WEBSOCKET = True  # Wake on fills / new candles pushed over the websocket
+HEARTBEAT_FILE = "bot_heartbeat"  # Touched every loop iteration (read by healthcheck.py)
+STATUS_LOG_INTERVAL_SEC = 300  # Balance/PnL line at INFO at most this often (DEBUG otherwise); 0 = every loop
 SENTIMENT_CHECK_INTERVAL_MIN = 60  # Refresh AI analysis every 60min
 
 # Risk management
@@ -58,13 +62,24 @@ TRAILING_STOP_ACTIVATION = 0.02  # Activate trailing after 2% profit
 TRAILING_STOP_DISTANCE = 0.01  # Trail by 1%
 
 
+def _parse_dex(asset: str) -> str:
+    return asset.split(':', 1)[0] if ':' in asset else ''
+
+
+# Asset -> dex lookup tables, built once at import
+_ASSET_DEX = {a: _parse_dex(a) for a in ASSETS}
+_XYZ_ASSETS = frozenset(a for a, d in _ASSET_DEX.items() if d == 'xyz')
+XYZ_ASSETS = _XYZ_ASSETS
+
+
 def is_xyz_asset(asset: str) -> bool:
     """Check if asset is on xyz HIP-3 dex"""
+    if asset in _ASSET_DEX:
+        return asset in _XYZ_ASSETS
     return asset.startswith('xyz:')
 
 
 def get_dex(asset: str) -> str:
     """Get dex name for an asset"""
-    if ':' in asset:
-        return asset.split(':')[0]
-    return ''
+    dex = _ASSET_DEX.get(asset)
+    return dex if dex is not None else _parse_dex(asset)
@@ -27,7 +27,7 @@ ssh -i "$EC2_KEY" -o StrictHostKeyChecking=no "$EC2_HOST" \
 
 echo "=== Restarting bot in tmux ==="
 ssh -i "$EC2_KEY" -o StrictHostKeyChecking=no "$EC2_HOST" \
-    "tmux send-keys -t trading C-c 2>/dev/null; sleep 2; tmux kill-session -t trading 2>/dev/null; sleep 1; tmux new-session -d -s trading 'cd $REMOTE_DIR && source venv/bin/activate && python3 bot.py'"
+    "tmux send-keys -t trading C-c 2>/dev/null; sleep 2; tmux kill-session -t trading 2>/dev/null; sleep 1; tmux new-session -d -s trading 'cd $REMOTE_DIR && source venv/bin/activate && PYTHON_JIT=1 python3 bot.py'"
 
 echo "=== Deploy complete! ==="
 echo "Check logs: ssh -i $EC2_KEY $EC2_HOST 'tail -f $REMOTE_DIR/trading_bot.log'"
@@ -5,8 +5,12 @@ All transactions go through ChainManager for gas tracking and budget control.
 Designed for micro amounts ($0.10-$0.50) used in airdrop farming.
 """
 
+import functools
+import json
+import os
 import time
 import logging
+from eth_abi import decode as abi_decode, encode as abi_encode
 from web3 import Web3
 from eth_account import Account
 
@@ -14,32 +18,7 @@ import farmer_config
 
 logger = logging.getLogger(__name__)
 
-# --- Minimal ABIs (inline) ---
-
-UNISWAP_V3_ROUTER_ABI = [
-    {
-        "inputs": [
-            {
-                "components": [
-                    {"name": "tokenIn", "type": "address"},
-                    {"name": "tokenOut", "type": "address"},
-                    {"name": "fee", "type": "uint24"},
-                    {"name": "recipient", "type": "address"},
-                    {"name": "deadline", "type": "uint256"},
-                    {"name": "amountIn", "type": "uint256"},
-                    {"name": "amountOutMinimum", "type": "uint256"},
-                    {"name": "sqrtPriceLimitX96", "type": "uint160"},
-                ],
-                "name": "params",
-                "type": "tuple",
-            }
-        ],
-        "name": "exactInputSingle",
-        "outputs": [{"name": "amountOut", "type": "uint256"}],
-        "stateMutability": "payable",
-        "type": "function",
-    }
-]
+# --- Minimal ABI (inline) for ERC20 view calls ---
 
 ERC20_ABI = [
     {
@@ -65,45 +44,60 @@ ERC20_ABI = [
     },
 ]
 
-AERODROME_ROUTER_ABI = [
-    {
-        "inputs": [
-            {"name": "token", "type": "address"},
-            {"name": "stable", "type": "bool"},
-            {"name": "amountTokenDesired", "type": "uint256"},
-            {"name": "amountTokenMin", "type": "uint256"},
-            {"name": "amountETHMin", "type": "uint256"},
-            {"name": "to", "type": "address"},
-            {"name": "deadline", "type": "uint256"},
-        ],
-        "name": "addLiquidityETH",
-        "outputs": [
-            {"name": "amountToken", "type": "uint256"},
-            {"name": "amountETH", "type": "uint256"},
-            {"name": "liquidity", "type": "uint256"},
-        ],
-        "stateMutability": "payable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"name": "token", "type": "address"},
-            {"name": "stable", "type": "bool"},
-            {"name": "liquidity", "type": "uint256"},
-            {"name": "amountTokenMin", "type": "uint256"},
-            {"name": "amountETHMin", "type": "uint256"},
-            {"name": "to", "type": "address"},
-            {"name": "deadline", "type": "uint256"},
-        ],
-        "name": "removeLiquidityETH",
-        "outputs": [
-            {"name": "amountToken", "type": "uint256"},
-            {"name": "amountETH", "type": "uint256"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-]
+# --- Pre-computed selectors + arg types: calldata is encoded directly with
+# eth_abi instead of going through web3's ContractFunction machinery ---
+
+
+def _selector(signature):
+    return bytes(Web3.keccak(text=signature)[:4])
+
+
+# ERC20 approve(spender, amount)
+SEL_APPROVE = _selector("approve(address,uint256)")
+APPROVE_TYPES = ["address", "uint256"]
+
+# Uniswap V3 exactInputSingle((tokenIn, tokenOut, fee, recipient, deadline,
+#                              amountIn, amountOutMinimum, sqrtPriceLimitX96))
+SEL_EXACT_INPUT_SINGLE = _selector(
+    "exactInputSingle((address,address,uint24,address,uint256,uint256,uint256,uint160))"
+)
+EXACT_INPUT_SINGLE_TYPES = ["(address,address,uint24,address,uint256,uint256,uint256,uint160)"]
+
+# Aerodrome addLiquidityETH / removeLiquidityETH(token, stable, amount/liquidity,
+#                                                 amountTokenMin, amountETHMin, to, deadline)
+SEL_ADD_LIQUIDITY_ETH = _selector("addLiquidityETH(address,bool,uint256,uint256,uint256,address,uint256)")
+SEL_REMOVE_LIQUIDITY_ETH = _selector("removeLiquidityETH(address,bool,uint256,uint256,uint256,address,uint256)")
+LIQUIDITY_ETH_TYPES = ["address", "bool", "uint256", "uint256", "uint256", "address", "uint256"]
+
+# Fixed gas limits, with headroom over typical usage on Base — avoids an
+# eth_estimateGas round-trip per tx (only gas actually used is paid)
+GAS_APPROVE = 60_000
+GAS_SWAP = 250_000
+GAS_LIQUIDITY = 350_000
+
+# Approvals are unlimited so each (wallet, token, spender) pair is approved once, ever
+MAX_UINT256 = 2**256 - 1
+
+# ERC20 view selectors for raw eth_call payloads (batched prefetch)
+_SEL_ALLOWANCE = "0xdd62ed3e"   # allowance(address,address)
+_SEL_BALANCE_OF = "0x70a08231"  # balanceOf(address)
+
+# Multicall3 — same address on Base and every major EVM chain
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+# aggregate3((target, allowFailure, callData)[]) -> (success, returnData)[]
+SEL_AGGREGATE3 = _selector("aggregate3((address,bool,bytes)[])")
+
+
+# Checksumming hashes the address (keccak) — memoize, the same few addresses recur
+_cs = functools.lru_cache(maxsize=4096)(Web3.to_checksum_address)
+
+# Canonical WETH predeploy on Base / OP-stack chains (fallback when TOKENS has no entry)
+BASE_WETH = _cs("0x4200000000000000000000000000000000000006")
+
+
+def _addr_word(address):
+    """ABI-encode an address as one 32-byte word (hex, no 0x)."""
+    return address[2:].lower().rjust(64, "0")
 
 
 class DexSwapper:
@@ -112,6 +106,56 @@ class DexSwapper:
     def __init__(self, chain_manager):
         """Initialize with a ChainManager instance for web3 access and gas tracking."""
         self.cm = chain_manager
+        # (id(w3), address, id(abi)) -> contract; rebuilt when a chain reconnects
+        self._contracts = {}
+        # Static per-chain config, resolved once for the tx builders
+        self._chain_ids = {c: cfg["chain_id"] for c, cfg in farmer_config.CHAINS.items()}
+        self._weth = {c: _cs(t["WETH"]) for c, t in farmer_config.TOKENS.items() if "WETH" in t}
+        self._approved = self._load_approved()
+
+    # --- Approval persistence ---
+
+    def _load_approved(self):
+        if os.path.exists(farmer_config.APPROVALS_FILE):
+            try:
+                with open(farmer_config.APPROVALS_FILE, "r") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError):
+                pass
+        return {}
+
+    def _is_approved(self, owner, chain, token, spender):
+        return self._approved.get(owner, {}).get(chain, {}).get(token, {}).get(spender, False)
+
+    def _mark_approved(self, owner, chain, token, spender):
+        self._approved.setdefault(owner, {}).setdefault(chain, {}).setdefault(token, {})[spender] = True
+        try:
+            with open(farmer_config.APPROVALS_FILE, "w") as f:
+                json.dump(self._approved, f, indent=2)
+        except IOError as e:
+            logger.warning(f"Could not persist approval state: {e}")
+
+    def _contract(self, w3, address, abi):
+        """Return a cached contract object for a checksummed address."""
+        key = (id(w3), address, id(abi))
+        contract = self._contracts.get(key)
+        if contract is None or contract.w3 is not w3:
+            contract = self._contracts[key] = w3.eth.contract(address=address, abi=abi)
+        return contract
+
+    def _build_tx(self, chain, sender, to, data, gas, value=0):
+        """Hand-built tx dict for pre-encoded calldata with a fixed gas limit.
+
+        No RPC here: fees (cached) and nonce are filled by ChainManager.send_transaction.
+        """
+        return {
+            "from": sender,
+            "to": to,
+            "value": value,
+            "data": data,
+            "gas": gas,
+            "chainId": self._chain_ids[chain],
+        }
 
     def _get_deadline(self, seconds=300):
         """Return a deadline timestamp (now + seconds)."""
@@ -121,6 +165,39 @@ class DexSwapper:
         """Derive account address from private key."""
         return Account.from_key(wallet_key)
 
+    def _prefetch_swap_state(self, chain, owner, token_address, spender):
+        """Fetch allowance, token balance and pending nonce for a swap.
+
+        One JSON-RPC batch round-trip; falls back to individual calls if the
+        RPC rejects batching. Returns {"allowance", "balance", "nonce"}.
+        """
+        token_addr = _cs(token_address)
+        spender_addr = _cs(spender)
+        try:
+            allowance, balance, nonce = self.cm.batch_call(chain, [
+                ("eth_call", [{"to": token_addr,
+                               "data": _SEL_ALLOWANCE + _addr_word(owner) + _addr_word(spender_addr)},
+                              "latest"]),
+                ("eth_call", [{"to": token_addr, "data": _SEL_BALANCE_OF + _addr_word(owner)}, "latest"]),
+                ("eth_getTransactionCount", [owner, "pending"]),
+            ])
+            if None not in (allowance, balance, nonce):
+                return {
+                    "allowance": int(allowance, 16),
+                    "balance": int(balance, 16),
+                    "nonce": int(nonce, 16),
+                }
+        except Exception as e:
+            logger.debug(f"Swap prefetch batch failed on {chain}, using single calls: {e}")
+
+        w3 = self.cm.get_web3(chain)
+        token = self._contract(w3, token_addr, ERC20_ABI)
+        return {
+            "allowance": token.functions.allowance(owner, spender_addr).call(),
+            "balance": token.functions.balanceOf(owner).call(),
+            "nonce": w3.eth.get_transaction_count(owner, "pending"),
+        }
+
     def get_token_balance(self, chain, token_address, wallet_address):
         """Check ERC20 balance for a wallet.
 
@@ -128,12 +205,9 @@ class DexSwapper:
         """
         try:
             w3 = self.cm.get_web3(chain)
-            token = w3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
-                abi=ERC20_ABI,
-            )
+            token = self._contract(w3, _cs(token_address), ERC20_ABI)
             balance = token.functions.balanceOf(
-                Web3.to_checksum_address(wallet_address)
+                _cs(wallet_address)
             ).call()
             logger.info(f"Balance of {token_address[:10]}... for {wallet_address[:10]}...: {balance}")
             return balance
@@ -141,35 +215,75 @@ class DexSwapper:
             logger.error(f"Failed to get token balance: {e}")
             return 0
 
-    def approve_token(self, chain, token_address, spender, amount, wallet_key):
-        """Approve spender to spend ERC20 tokens.
+    def get_token_balances_multi(self, chain, pairs):
+        """Raw ERC20 balances for many (token, wallet) pairs in one eth_call.
 
-        Checks current allowance first; skips if already sufficient.
-        Returns tx_hash on success, None on failure.
+        Folds every balanceOf into a single Multicall3 aggregate3 call; falls
+        back to get_token_balance per pair if the multicall itself fails.
+        Returns balances in the order of `pairs` (0 for failed subcalls).
         """
+        if not pairs:
+            return []
+        calls = [
+            (_cs(token), True, bytes.fromhex(_SEL_BALANCE_OF[2:] + _addr_word(_cs(wallet))))
+            for token, wallet in pairs
+        ]
         try:
             w3 = self.cm.get_web3(chain)
+            raw = w3.eth.call({
+                "to": MULTICALL3,
+                "data": SEL_AGGREGATE3 + abi_encode(["(address,bool,bytes)[]"], [calls]),
+            })
+            (results,) = abi_decode(["(bool,bytes)[]"], raw)
+            return [
+                int.from_bytes(data[:32], "big") if ok and len(data) >= 32 else 0
+                for ok, data in results
+            ]
+        except Exception as e:
+            logger.warning(f"Multicall balance sweep failed on {chain}, querying one by one: {e}")
+            return [self.get_token_balance(chain, token, wallet) for token, wallet in pairs]
+
+    def approve_token(self, chain, token_address, spender, amount, wallet_key,
+                      allowance=None):
+        """Approve spender to spend ERC20 tokens (unlimited, once per pair).
+
+        Pairs recorded in APPROVALS_FILE skip straight through with no RPC.
+        Otherwise checks current allowance first (unless a prefetched
+        `allowance` is given); skips if already sufficient.
+        Returns tx_hash on success, None on failure.
+        """
+        try:
             account = self._get_account(wallet_key)
-            token_addr = Web3.to_checksum_address(token_address)
-            spender_addr = Web3.to_checksum_address(spender)
+            token_addr = _cs(token_address)
+            spender_addr = _cs(spender)
 
-            token = w3.eth.contract(address=token_addr, abi=ERC20_ABI)
+            if self._is_approved(account.address, chain, token_addr, spender_addr):
+                return "already_approved"
 
             # Check existing allowance
-            current_allowance = token.functions.allowance(account.address, spender_addr).call()
+            current_allowance = allowance
+            if current_allowance is None:
+                w3 = self.cm.get_web3(chain)
+                token = self._contract(w3, token_addr, ERC20_ABI)
+                current_allowance = token.functions.allowance(account.address, spender_addr).call()
             if current_allowance >= amount:
                 logger.info(f"Allowance already sufficient ({current_allowance} >= {amount})")
+                if current_allowance >= MAX_UINT256 // 2:
+                    self._mark_approved(account.address, chain, token_addr, spender_addr)
                 return "already_approved"
 
-            # Build approve tx
-            tx = token.functions.approve(spender_addr, amount).build_transaction({
-                "from": account.address,
-                "nonce": w3.eth.get_transaction_count(account.address),
-                "chainId": farmer_config.CHAINS[chain]["chain_id"],
-            })
-
-            tx_hash = self.cm.send_transaction(chain, tx, wallet_key)
-            logger.info(f"Approved {token_address[:10]}... for {spender[:10]}..., tx: {tx_hash}")
+            # Build approve tx (nonce is allocated by ChainManager at send time)
+            data = SEL_APPROVE + abi_encode(APPROVE_TYPES, [spender_addr, MAX_UINT256])
+            tx = self._build_tx(chain, account.address, token_addr, data, GAS_APPROVE)
+
+            # Callers build a dependent tx next, so block until the approval is mined;
+            # send_transaction returns None unless the receipt came back with status 1
+            tx_hash = self.cm.send_transaction(chain, tx, wallet_key, wait_for_receipt=True)
+            if tx_hash:
+                logger.info(f"Approved {token_address[:10]}... for {spender[:10]}..., tx: {tx_hash}")
+                self._mark_approved(account.address, chain, token_addr, spender_addr)
+            else:
+                logger.warning(f"Approve {token_address[:10]}... for {spender[:10]}... not confirmed")
             return tx_hash
 
         except Exception as e:
@@ -189,18 +303,13 @@ class DexSwapper:
         Returns tx_hash on success, None on failure.
         """
         try:
-            w3 = self.cm.get_web3(chain)
             account = self._get_account(wallet_key)
-            amount_wei = w3.to_wei(amount_eth, "ether")
+            amount_wei = Web3.to_wei(amount_eth, "ether")
 
-            tokens = farmer_config.TOKENS.get(chain, {})
-            weth_address = Web3.to_checksum_address(tokens.get("WETH", "0x4200000000000000000000000000000000000006"))
-            token_out_addr = Web3.to_checksum_address(token_out)
+            weth_address = self._weth.get(chain, BASE_WETH)
+            token_out_addr = _cs(token_out)
 
-            router = w3.eth.contract(
-                address=Web3.to_checksum_address(farmer_config.UNISWAP_V3_ROUTER),
-                abi=UNISWAP_V3_ROUTER_ABI,
-            )
+            router_addr = _cs(farmer_config.UNISWAP_V3_ROUTER)
 
             # For micro amounts, amountOutMinimum=0 is acceptable
             # The slippage protection is implicit via the small amount being swapped
@@ -215,12 +324,9 @@ class DexSwapper:
                 0,                      # sqrtPriceLimitX96 (no limit)
             )
 
-            tx = router.functions.exactInputSingle(params).build_transaction({
-                "from": account.address,
-                "value": amount_wei,  # Send ETH with the call
-                "nonce": w3.eth.get_transaction_count(account.address),
-                "chainId": farmer_config.CHAINS[chain]["chain_id"],
-            })
+            data = SEL_EXACT_INPUT_SINGLE + abi_encode(EXACT_INPUT_SINGLE_TYPES, [params])
+            # Send ETH with the call
+            tx = self._build_tx(chain, account.address, router_addr, data, GAS_SWAP, value=amount_wei)
 
             tx_hash = self.cm.send_transaction(chain, tx, wallet_key)
             logger.info(
@@ -247,30 +353,28 @@ class DexSwapper:
         Returns tx_hash on success, None on failure.
         """
         try:
-            w3 = self.cm.get_web3(chain)
             account = self._get_account(wallet_key)
 
-            tokens = farmer_config.TOKENS.get(chain, {})
-            weth_address = Web3.to_checksum_address(tokens.get("WETH", "0x4200000000000000000000000000000000000006"))
-            token_in_addr = Web3.to_checksum_address(token_in)
+            weth_address = self._weth.get(chain, BASE_WETH)
+            token_in_addr = _cs(token_in)
             router_addr = farmer_config.UNISWAP_V3_ROUTER
 
+            # Allowance, balance and nonce in one round-trip
+            state = self._prefetch_swap_state(chain, account.address, token_in, router_addr)
+            if state["balance"] < amount:
+                logger.error(f"Insufficient {token_in[:10]}... balance ({state['balance']} < {amount}), aborting swap")
+                return None
+            # The batched pending count seeds the nonce counter for free
+            self.cm.nonces.seed(chain, account.address, state["nonce"])
+
             # Step 1: Approve router to spend tokens
-            approve_result = self.approve_token(chain, token_in, router_addr, amount, wallet_key)
+            approve_result = self.approve_token(chain, token_in, router_addr, amount, wallet_key,
+                                                allowance=state["allowance"])
             if approve_result is None:
                 logger.error("Token approval failed, aborting swap")
                 return None
 
-            # Wait a moment for approval to confirm (if it was a new tx)
-            if approve_result != "already_approved":
-                time.sleep(5)
-
             # Step 2: Build swap tx
-            router = w3.eth.contract(
-                address=Web3.to_checksum_address(router_addr),
-                abi=UNISWAP_V3_ROUTER_ABI,
-            )
-
             params = (
                 token_in_addr,          # tokenIn
                 weth_address,           # tokenOut (WETH -> unwrapped to ETH)
@@ -282,12 +386,9 @@ class DexSwapper:
                 0,                      # sqrtPriceLimitX96
             )
 
-            tx = router.functions.exactInputSingle(params).build_transaction({
-                "from": account.address,
-                "value": 0,  # No ETH sent for token->ETH swaps
-                "nonce": w3.eth.get_transaction_count(account.address),
-                "chainId": farmer_config.CHAINS[chain]["chain_id"],
-            })
+            data = SEL_EXACT_INPUT_SINGLE + abi_encode(EXACT_INPUT_SINGLE_TYPES, [params])
+            # No ETH sent for token->ETH swaps
+            tx = self._build_tx(chain, account.address, _cs(router_addr), data, GAS_SWAP)
 
             tx_hash = self.cm.send_transaction(chain, tx, wallet_key)
             logger.info(
@@ -312,11 +413,10 @@ class DexSwapper:
         Returns tx_hash on success, None on failure.
         """
         try:
-            w3 = self.cm.get_web3(chain)
             account = self._get_account(wallet_key)
-            amount_eth_wei = w3.to_wei(amount_eth, "ether")
-            token_addr = Web3.to_checksum_address(token)
-            router_addr = Web3.to_checksum_address(farmer_config.AERODROME_ROUTER)
+            amount_eth_wei = Web3.to_wei(amount_eth, "ether")
+            token_addr = _cs(token)
+            router_addr = _cs(farmer_config.AERODROME_ROUTER)
 
             # Approve token for Aerodrome router
             approve_result = self.approve_token(chain, token, farmer_config.AERODROME_ROUTER, amount_token, wallet_key)
@@ -324,17 +424,12 @@ class DexSwapper:
                 logger.error("Token approval failed for liquidity add")
                 return None
 
-            if approve_result != "already_approved":
-                time.sleep(5)
-
             # Build addLiquidityETH tx
-            router = w3.eth.contract(address=router_addr, abi=AERODROME_ROUTER_ABI)
-
             # Use 5% slippage for liquidity (wider tolerance for micro amounts)
             amount_token_min = int(amount_token * 0.95)
             amount_eth_min = int(amount_eth_wei * 0.95)
 
-            tx = router.functions.addLiquidityETH(
+            data = SEL_ADD_LIQUIDITY_ETH + abi_encode(LIQUIDITY_ETH_TYPES, [
                 token_addr,         # token
                 False,              # stable (volatile pair)
                 amount_token,       # amountTokenDesired
@@ -342,12 +437,8 @@ class DexSwapper:
                 amount_eth_min,     # amountETHMin
                 account.address,    # to (LP tokens recipient)
                 self._get_deadline(),  # deadline
-            ).build_transaction({
-                "from": account.address,
-                "value": amount_eth_wei,
-                "nonce": w3.eth.get_transaction_count(account.address),
-                "chainId": farmer_config.CHAINS[chain]["chain_id"],
-            })
+            ])
+            tx = self._build_tx(chain, account.address, router_addr, data, GAS_LIQUIDITY, value=amount_eth_wei)
 
             tx_hash = self.cm.send_transaction(chain, tx, wallet_key)
             logger.info(
@@ -371,14 +462,11 @@ class DexSwapper:
         Returns tx_hash on success, None on failure.
         """
         try:
-            w3 = self.cm.get_web3(chain)
             account = self._get_account(wallet_key)
-            token_addr = Web3.to_checksum_address(token)
-            router_addr = Web3.to_checksum_address(farmer_config.AERODROME_ROUTER)
+            token_addr = _cs(token)
+            router_addr = _cs(farmer_config.AERODROME_ROUTER)
 
-            router = w3.eth.contract(address=router_addr, abi=AERODROME_ROUTER_ABI)
-
-            tx = router.functions.removeLiquidityETH(
+            data = SEL_REMOVE_LIQUIDITY_ETH + abi_encode(LIQUIDITY_ETH_TYPES, [
                 token_addr,         # token
                 False,              # stable (volatile pair)
                 liquidity_amount,   # liquidity (LP tokens to burn)
@@ -386,11 +474,8 @@ class DexSwapper:
                 0,                  # amountETHMin
                 account.address,    # to
                 self._get_deadline(),  # deadline
-            ).build_transaction({
-                "from": account.address,
-                "nonce": w3.eth.get_transaction_count(account.address),
-                "chainId": farmer_config.CHAINS[chain]["chain_id"],
-            })
+            ])
+            tx = self._build_tx(chain, account.address, router_addr, data, GAS_LIQUIDITY)
 
             tx_hash = self.cm.send_transaction(chain, tx, wallet_key)
             logger.info(
@@ -1,29 +1,33 @@
 """Centralized credential loader — reads from env vars or ~/.claude-env"""
 import os
+import re
 
 _CLAUDE_ENV_PATH = os.path.expanduser("~/.claude-env")
+# One `[export ]KEY=value` per line; comment and blank lines don't match
+_ENV_LINE_RE = re.compile(r"^[ \t]*(?:export[ \t]+)?([^#=\s][^=\n]*?)[ \t]*=([^\n]*)$", re.M)
 _cache = {}
+_cache_mtime = None
 
 
 def _parse_claude_env():
-    """Parse ~/.claude-env file (format: export VAR=value or VAR=value)."""
-    if _cache:
+    """Parse ~/.claude-env file (format: export VAR=value or VAR=value).
+
+    Re-parsed only when the file's mtime changes.
+    """
+    global _cache, _cache_mtime
+    try:
+        mtime = os.stat(_CLAUDE_ENV_PATH).st_mtime
+    except OSError:
         return _cache
-    if not os.path.exists(_CLAUDE_ENV_PATH):
+    if mtime == _cache_mtime:
         return _cache
     with open(_CLAUDE_ENV_PATH) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if line.startswith("export "):
-                line = line[7:]
-            if "=" not in line:
-                continue
-            key, _, value = line.partition("=")
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            _cache[key] = value
+        text = f.read()
+    _cache = {
+        m[1]: m[2].strip().strip('"').strip("'")
+        for m in _ENV_LINE_RE.finditer(text)
+    }
+    _cache_mtime = mtime
     return _cache
 
 
@@ -35,11 +39,8 @@ def get_key(name, required=True):
         required: If True (default), raises RuntimeError when missing.
                   If False, returns None when missing.
     """
-    value = os.environ.get(name)
-    if value:
-        return value
-    env_data = _parse_claude_env()
-    value = env_data.get(name)
+    # os.environ is read at lookup time so keys set after import still win
+    value = os.environ.get(name) or _parse_claude_env().get(name)
     if value:
         return value
     if required:
@@ -48,3 +49,13 @@ def get_key(name, required=True):
             f"Set it as an env var or add it to {_CLAUDE_ENV_PATH}"
         )
     return None
+
+
+def get_keys_prefix(prefix):
+    """Return {name: value} for every credential whose name starts with prefix, sorted by name.
+
+    e.g. get_keys_prefix("WALLET_") for multi-wallet farming.
+    """
+    merged = {k: v for k, v in _parse_claude_env().items() if v and k.startswith(prefix)}
+    merged.update((k, v) for k, v in os.environ.items() if v and k.startswith(prefix))
+    return dict(sorted(merged.items()))
@@ -79,3 +79,4 @@ TOKENS = {
 WALLETS_FILE = "farming_wallets.json"
 FARM_STATE_FILE = "farm_state.json"
 FARM_SCHEDULE_FILE = "farm_schedule.json"
+APPROVALS_FILE = "approved.json"  # {wallet: {chain: {token: {spender: true}}}} — unlimited approvals sent
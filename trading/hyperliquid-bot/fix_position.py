@@ -1,6 +1,5 @@
 """Fix the open BTC position: add SL and TP that failed earlier"""
 
-import time
 from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 from hyperliquid.utils import constants
@@ -20,20 +19,16 @@ tp_price = float(int(entry * (1 + 0.04)))  # 4% TP = ~71546
 
 print(f"Setting SL at ${sl_price:.0f} and TP at ${tp_price:.0f} for BTC long {size}")
 
-# SL (sell to close)
-sl_result = exchange.order(
-    "BTC", False, size, sl_price,
-    {"trigger": {"triggerPx": sl_price, "isMarket": True, "tpsl": "sl"}}
-)
-print(f"SL result: {sl_result}")
-time.sleep(1)
-
-# TP (sell to close)
-tp_result = exchange.order(
-    "BTC", False, size, tp_price,
-    {"trigger": {"triggerPx": tp_price, "isMarket": True, "tpsl": "tp"}}
-)
-print(f"TP result: {tp_result}")
+# SL + TP (sell to close) in one bulk request
+result = exchange.bulk_orders([
+    {"coin": "BTC", "is_buy": False, "sz": size, "limit_px": sl_price,
+     "order_type": {"trigger": {"triggerPx": sl_price, "isMarket": True, "tpsl": "sl"}},
+     "reduce_only": False},
+    {"coin": "BTC", "is_buy": False, "sz": size, "limit_px": tp_price,
+     "order_type": {"trigger": {"triggerPx": tp_price, "isMarket": True, "tpsl": "tp"}},
+     "reduce_only": False},
+])
+print(f"SL/TP result: {result}")
 
 # Verify
 state = info.user_state(config.ACCOUNT_ADDRESS)
@@ -2,13 +2,27 @@
 import os
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional speedup — stdlib json works the same, just slower
+    _json_loads = json.loads
+
+
+HEARTBEAT_FILE = "bot_heartbeat"
+# Bot touches the heartbeat every loop: <= 45s normally, up to 300s while paused
+HEARTBEAT_MAX_AGE_SEC = 330
+
 
 def check_bot_process():
-    """Check if bot is running in tmux"""
-    result = os.popen("tmux list-panes -t trading -F '#{pane_current_command}' 2>/dev/null").read()
-    return "python" in result.lower()
+    """Check if bot is alive via the heartbeat file it touches every loop"""
+    try:
+        return time.time() - os.path.getmtime(HEARTBEAT_FILE) < HEARTBEAT_MAX_AGE_SEC
+    except OSError:
+        return False
 
 
 def check_last_log(log_path="trading_bot.log"):
@@ -39,53 +53,70 @@ def check_balance():
 def check_trades():
     """Summary of recent trades"""
     if os.path.exists("trades_history.json"):
-        with open("trades_history.json") as f:
-            trades = json.load(f)
+        with open("trades_history.json", "rb") as f:
+            trades = _json_loads(f.read())
         closed = [t for t in trades if t["status"] == "closed"]
         open_t = [t for t in trades if t["status"] == "open"]
         return len(trades), len(closed), len(open_t)
     return 0, 0, 0
 
 
+def tail_lines(path, n, block=8192):
+    """Last n lines of a file without reading all of it. Returns (lines, file_size)."""
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - block))
+        tail = f.read().decode(errors="replace").splitlines()
+    # Drop a partial first line if we started mid-file
+    if size > block and tail:
+        tail = tail[1:]
+    return tail[-n:], size
+
+
 def main():
     print("=" * 50)
     print("HEALTHCHECK -- Hyperliquid Bot v5")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 50)
 
+    # Independent checks run side by side — the balance API call dominates
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        process_f = pool.submit(check_bot_process)
+        log_f = pool.submit(check_last_log)
+        balance_f = pool.submit(check_balance)
+        trades_f = pool.submit(check_trades)
+
     # Process
-    running = check_bot_process()
+    running = process_f.result()
     print(f"Bot process: {'OK' if running else 'NOT RUNNING'}")
 
     # Logs
-    log_ok, log_msg = check_last_log()
+    log_ok, log_msg = log_f.result()
     print(f"Log freshness: {'OK' if log_ok else 'STALE'} ({log_msg})")
 
     # Balance
-    balance, positions = check_balance()
+    balance, positions = balance_f.result()
     if balance is not None:
         print(f"Balance: ${balance:.2f} | Open positions: {positions}")
     else:
         print(f"Balance: ERROR ({positions})")
 
     # Trades
-    total, closed, open_t = check_trades()
+    total, closed, open_t = trades_f.result()
     print(f"Trades: {total} total, {closed} closed, {open_t} open")
 
     # Strategy state
     if os.path.exists("strategy_state.json"):
-        with open("strategy_state.json") as f:
-            state = json.load(f)
+        with open("strategy_state.json", "rb") as f:
+            state = _json_loads(f.read())
         print(f"Adapter: threshold={state.get('min_score_threshold', '?')}, "
               f"adaptations={state.get('adaptation_count', 0)}")
 
     # Recent alerts
     if os.path.exists("alerts.log"):
-        with open("alerts.log") as f:
-            lines = f.readlines()
-        recent = lines[-5:] if len(lines) >= 5 else lines
+        recent, size = tail_lines("alerts.log", 5)
         if recent:
-            print(f"Recent alerts ({len(lines)} total):")
+            print(f"Recent alerts (log size {size / 1024:.1f} KB):")
             for line in recent:
                 print(f"  {line.rstrip()}")
         else:
@@ -0,0 +1,27 @@
+"""Shared keep-alive HTTP session for Hyperliquid SDK clients.
+
+The SDK gives every Info/Exchange its own requests.Session. Pointing them
+all at one pooled session lets TLS connections be reused across clients.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+# Retry connect failures and 502/503/504; urllib3's default allowed_methods
+# excludes POST for status retries, so signed actions are never resent
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16, pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+))
+
+
+def share_session(*clients):
+    """Point SDK clients (Info/Exchange, and an Exchange's inner Info) at SESSION"""
+    for client in clients:
+        client.session = SESSION
+        inner = getattr(client, "info", None)
+        if inner is not None:
+            inner.session = SESSION
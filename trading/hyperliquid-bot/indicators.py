@@ -4,27 +4,45 @@ import numpy as np
 from typing import Dict, Optional
 
 
+# Block length for the closed-form Wilder recursion; bounds the a**-k amplification (rounding error)
+_WILDER_BLOCK = 32
+
+
+def wilder_smooth(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder-smoothed series: seed = mean(values[:period]), then
+    s[t] = (s[t-1] * (period - 1) + values[t]) / period for each later value.
+
+    Returns len(values) - period + 1 points (the seed first). Vectorized via
+    s[k] = a**k * (s[0] + sum_j r[j] * a**-j), a = (period-1)/period, r = values/period.
+    """
+    a = (period - 1) / period
+    rest = values[period:] / period
+    out = np.empty(len(rest) + 1, dtype=np.result_type(values, np.float32))
+    out[0] = np.mean(values[:period])
+
+    pos = 1
+    for start in range(0, len(rest), _WILDER_BLOCK):
+        block = rest[start:start + _WILDER_BLOCK]
+        powers = a ** np.arange(1, len(block) + 1, dtype=out.dtype)
+        out[pos:pos + len(block)] = powers * (out[pos - 1] + np.cumsum(block / powers))
+        pos += len(block)
+    return out
+
+
 def calculate_rsi(prices: np.ndarray, period: int = 14) -> float:
     """Wilder's smoothed RSI"""
     if len(prices) < period + 1:
         return 50.0
 
     deltas = np.diff(prices)
-    gains = np.where(deltas > 0, deltas, 0.0)
-    losses = np.where(deltas < 0, -deltas, 0.0)
-
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
-
-    for i in range(period, len(gains)):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    avg_gain = wilder_smooth(np.maximum(deltas, 0.0), period)[-1]
+    avg_loss = wilder_smooth(np.maximum(-deltas, 0.0), period)[-1]
 
     if avg_loss == 0:
         return 100.0
 
     rs = avg_gain / avg_loss
-    return 100.0 - (100.0 / (1.0 + rs))
+    return float(100.0 - (100.0 / (1.0 + rs)))
 
 
 def calculate_bollinger_bands(prices: np.ndarray, period: int = 20, std_mult: float = 2.0) -> Optional[Dict]:
@@ -32,8 +50,8 @@ def calculate_bollinger_bands(prices: np.ndarray, period: int = 20, std_mult: fl
     if len(prices) < period:
         return None
 
-    sma = np.mean(prices[-period:])
-    std = np.std(prices[-period:])
+    sma = float(np.mean(prices[-period:]))
+    std = float(np.std(prices[-period:]))
 
     return {
         "middle": sma,
@@ -48,6 +66,12 @@ def calculate_adx(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, perio
     if len(closes) < period + 1:
         return {"adx": 0.0, "plus_di": 0.0, "minus_di": 0.0}
 
+    # Differences in float64: float32 rounding flips +DM/-DM ties and can swing
+    # ADX by several points (and the DI trend direction)
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    closes = np.asarray(closes, dtype=np.float64)
+
     # True Range
     tr = np.maximum(
         highs[1:] - lows[1:],
@@ -64,55 +88,58 @@ def calculate_adx(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, perio
     plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
     minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
 
-    # Wilder smoothing
-    atr = np.mean(tr[:period])
-    plus_di_smooth = np.mean(plus_dm[:period])
-    minus_di_smooth = np.mean(minus_dm[:period])
+    # Wilder smoothing — the first smoothed point is the seed, DI/DX start after it
+    atr = wilder_smooth(tr, period)[1:]
+    plus_smooth = wilder_smooth(plus_dm, period)[1:]
+    minus_smooth = wilder_smooth(minus_dm, period)[1:]
 
-    dx_values = []
-    last_plus_di = 0.0
-    last_minus_di = 0.0
-
-    for i in range(period, len(tr)):
-        atr = (atr * (period - 1) + tr[i]) / period
-        plus_di_smooth = (plus_di_smooth * (period - 1) + plus_dm[i]) / period
-        minus_di_smooth = (minus_di_smooth * (period - 1) + minus_dm[i]) / period
-
-        if atr == 0:
-            continue
-
-        last_plus_di = 100 * plus_di_smooth / atr
-        last_minus_di = 100 * minus_di_smooth / atr
-
-        di_sum = last_plus_di + last_minus_di
-        if di_sum == 0:
-            continue
+    valid = atr != 0
+    if not valid.any():
+        return {"adx": 0.0, "plus_di": 0.0, "minus_di": 0.0}
 
-        dx = 100 * abs(last_plus_di - last_minus_di) / di_sum
-        dx_values.append(dx)
+    plus_di = 100 * plus_smooth[valid] / atr[valid]
+    minus_di = 100 * minus_smooth[valid] / atr[valid]
+    di_sum = plus_di + minus_di
+    nonzero = di_sum != 0
+    dx_values = 100 * np.abs(plus_di - minus_di)[nonzero] / di_sum[nonzero]
 
-    if not dx_values:
+    if len(dx_values) == 0:
         return {"adx": 0.0, "plus_di": 0.0, "minus_di": 0.0}
 
-    adx = np.mean(dx_values[-period:]) if len(dx_values) >= period else np.mean(dx_values)
+    adx = np.mean(dx_values[-period:])
     return {
         "adx": float(adx),
-        "plus_di": float(last_plus_di),
-        "minus_di": float(last_minus_di),
+        "plus_di": float(plus_di[-1]),
+        "minus_di": float(minus_di[-1]),
     }
 
 
-def get_all_signals(candles: list, bb_period=20, bb_std=2.0, rsi_period=14, adx_period=14) -> Optional[Dict]:
-    """Compute all indicators from raw candle data"""
+def candles_to_array(candles: list, dtype=np.float32) -> np.ndarray:
+    """Pack raw candles into one (N, 4) array: close, high, low, volume.
+
+    float32 by default to halve the bytes the indicator passes touch. Values
+    are rounded to ~7 significant figures, so BB/RSI drift in the last digits;
+    calculate_adx upcasts to float64 because its DM tie-breaks are not that
+    tolerant. Pass dtype=np.float64 for bit-for-bit float64 results.
+    """
+    return np.array(
+        [(c['c'], c['h'], c['l'], c.get('v', 0)) for c in candles],
+        dtype=dtype
+    )
+
+
+def get_all_signals(candles, bb_period=20, bb_std=2.0, rsi_period=14, adx_period=14) -> Optional[Dict]:
+    """Compute all indicators from raw candle data or a candles_to_array() result"""
     if len(candles) < max(bb_period, rsi_period, adx_period) + 5:
         return None
 
-    closes = np.array([float(c['c']) for c in candles])
-    highs = np.array([float(c['h']) for c in candles])
-    lows = np.array([float(c['l']) for c in candles])
-    volumes = np.array([float(c.get('v', 0)) for c in candles])
+    data = candles if isinstance(candles, np.ndarray) else candles_to_array(candles)
+    closes = data[:, 0]
+    highs = data[:, 1]
+    lows = data[:, 2]
+    volumes = data[:, 3]
 
-    price = closes[-1]
+    price = float(closes[-1])
     rsi = calculate_rsi(closes, rsi_period)
     bb = calculate_bollinger_bands(closes, bb_period, bb_std)
     adx_data = calculate_adx(highs, lows, closes, adx_period)
@@ -126,7 +153,7 @@ def get_all_signals(candles: list, bb_period=20, bb_std=2.0, rsi_period=14, adx_
     # Volume confirmation (from v5)
     avg_volume_20 = np.mean(volumes[-21:-1]) if len(volumes) >= 21 else np.mean(volumes[:-1]) if len(volumes) > 1 else 1.0
     current_volume = volumes[-1]
-    volume_ratio = current_volume / avg_volume_20 if avg_volume_20 > 0 else 0.0
+    volume_ratio = float(current_volume / avg_volume_20) if avg_volume_20 > 0 else 0.0
 
     return {
         "price": price,
@@ -0,0 +1,57 @@
+"""On-disk answer cache for idempotent LLM queries (SQLite, keyed by prompt hash)
+
+Re-running a script with the same model + prompt inside the TTL returns the
+stored answer with no API call. Only successful answers should be put().
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Optional
+
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.db")
+
+_SCHEMA = """CREATE TABLE IF NOT EXISTS answers (
+    input_hash TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    expires_at INTEGER NOT NULL
+)"""
+
+
+def _connect() -> sqlite3.Connection:
+    # One short-lived connection per call — safe from any thread
+    conn = sqlite3.connect(DB_PATH, timeout=5)
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def make_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}|{prompt}".encode()).hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    """Cached answer for key, or None if missing/expired (or the cache is unusable)"""
+    try:
+        with _connect() as conn:
+            row = conn.execute(
+                "SELECT response FROM answers WHERE input_hash = ? AND expires_at > ?",
+                (key, int(time.time())),
+            ).fetchone()
+        return row[0] if row else None
+    except sqlite3.Error:
+        return None
+
+
+def put(key: str, value: str, ttl: int):
+    """Store value for ttl seconds; expired rows are pruned on write"""
+    now = int(time.time())
+    try:
+        with _connect() as conn:
+            conn.execute("DELETE FROM answers WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO answers (input_hash, response, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl),
+            )
+    except sqlite3.Error:
+        pass
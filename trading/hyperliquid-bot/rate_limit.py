@@ -0,0 +1,70 @@
+"""Client-side rate limiting for the LLM APIs (Perplexity, OpenRouter)
+
+A token bucket per host smooths bursts of concurrent queries under the
+provider's per-minute cap; post() also honours Retry-After on a 429.
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+MAX_429_RETRIES = 2
+DEFAULT_RETRY_AFTER_SEC = 5.0
+MAX_RETRY_AFTER_SEC = 60.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket: bursts up to `capacity`, refilled at `refill_per_sec`"""
+
+    def __init__(self, capacity: int, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until it is available.
+
+        Tokens may go negative: each caller reserves its slot under the lock
+        and sleeps outside it, so waiters are released in arrival order.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.refill_per_sec)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.refill_per_sec if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Per-host buckets, shared by every module in the process (20 requests/min each)
+PERPLEXITY_BUCKET = TokenBucket(capacity=20, refill_per_sec=20 / 60)
+OPENROUTER_BUCKET = TokenBucket(capacity=20, refill_per_sec=20 / 60)
+_BUCKETS = {
+    "api.perplexity.ai": PERPLEXITY_BUCKET,
+    "openrouter.ai": OPENROUTER_BUCKET,
+}
+
+
+def _retry_after(response, attempt: int) -> float:
+    try:
+        delay = float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        delay = DEFAULT_RETRY_AFTER_SEC * 2 ** attempt
+    return min(max(delay, 0.0), MAX_RETRY_AFTER_SEC)
+
+
+def post(session, url: str, **kwargs):
+    """session.post(url, **kwargs) through the host's bucket; retries 429s after Retry-After"""
+    bucket = _BUCKETS.get(urlparse(url).hostname)
+    for attempt in range(MAX_429_RETRIES + 1):
+        if bucket:
+            bucket.acquire()
+        response = session.post(url, **kwargs)
+        if response.status_code != 429 or attempt == MAX_429_RETRIES:
+            return response
+        delay = _retry_after(response, attempt)
+        response.close()
+        time.sleep(delay)
@@ -1,29 +1,51 @@
 """Research active and upcoming airdrops"""
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 
+import llm_cache
+import rate_limit
 from env_loader import get_key
 
 PERPLEXITY_KEY = get_key("PERPLEXITY_API_KEY")
 OPENROUTER_KEY = get_key("OPENROUTER_API_KEY")
 
-def ask_perplexity(prompt):
-    r = requests.post("https://api.perplexity.ai/chat/completions",
-        headers={"Authorization": f"Bearer {PERPLEXITY_KEY}", "Content-Type": "application/json"},
-        json={"model": "sonar-pro", "messages": [{"role": "user", "content": prompt}], "temperature": 0.1, "max_tokens": 1500},
+# Request pieces built once; each call only adds its messages
+PERPLEXITY_HEADERS = {"Authorization": f"Bearer {PERPLEXITY_KEY}", "Content-Type": "application/json"}
+OPENROUTER_HEADERS = {"Authorization": f"Bearer {OPENROUTER_KEY}", "Content-Type": "application/json"}
+_PX_BODY = {"model": "sonar-pro", "temperature": 0.1, "max_tokens": 1500}
+_GROK_BODY = {"model": "x-ai/grok-3", "temperature": 0.2, "max_tokens": 1500}
+
+# One keep-alive session shared by all (concurrent) queries
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+
+# Prompts are static, so answers are reused for an hour across reruns
+CACHE_TTL_SEC = 3600
+
+def _ask(url, headers, body, prompt):
+    cache_key = llm_cache.make_key(body["model"], prompt)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    r = rate_limit.post(session, url,
+        headers=headers, json={**body, "messages": [{"role": "user", "content": prompt}]},
         timeout=60)
-    return r.json()['choices'][0]['message']['content'] if r.status_code == 200 else f"Error {r.status_code}"
+    if r.status_code != 200:
+        return f"Error {r.status_code}"
+    answer = r.json()['choices'][0]['message']['content']
+    llm_cache.put(cache_key, answer, CACHE_TTL_SEC)
+    return answer
+
+def ask_perplexity(prompt):
+    return _ask("https://api.perplexity.ai/chat/completions", PERPLEXITY_HEADERS, _PX_BODY, prompt)
 
 def ask_grok(prompt):
-    r = requests.post("https://openrouter.ai/api/v1/chat/completions",
-        headers={"Authorization": f"Bearer {OPENROUTER_KEY}", "Content-Type": "application/json"},
-        json={"model": "x-ai/grok-3", "messages": [{"role": "user", "content": prompt}], "temperature": 0.2, "max_tokens": 1500},
-        timeout=60)
-    return r.json()['choices'][0]['message']['content'] if r.status_code == 200 else f"Error {r.status_code}"
+    return _ask("https://openrouter.ai/api/v1/chat/completions", OPENROUTER_HEADERS, _GROK_BODY, prompt)
 
-print("=" * 60)
-print("PERPLEXITY: BEST CRYPTO AIRDROPS TO FARM RIGHT NOW")
-print("=" * 60)
-r1 = ask_perplexity("""What are the BEST crypto airdrops to farm RIGHT NOW in February 2026?
+# Research queries: (title, provider, prompt)
+QUERIES = [
+    ("PERPLEXITY: BEST CRYPTO AIRDROPS TO FARM RIGHT NOW", ask_perplexity, """What are the BEST crypto airdrops to farm RIGHT NOW in February 2026?
 I need:
 1. Active confirmed airdrops (token not yet distributed)
 2. Testnets worth farming (high probability of airdrop)
@@ -40,25 +62,15 @@ For each, give:
 - Wallet requirements (new wallet? specific chain?)
 
 Focus on FREE opportunities (no capital needed) or ones that work with < $20.
-Current date: February 10, 2026.""")
-print(r1)
-
-print("\n" + "=" * 60)
-print("GROK: TWITTER ALPHA ON AIRDROPS")
-print("=" * 60)
-r2 = ask_grok("""What are crypto Twitter/X users farming for airdrops RIGHT NOW?
+Current date: February 10, 2026."""),
+    ("GROK: TWITTER ALPHA ON AIRDROPS", ask_grok, """What are crypto Twitter/X users farming for airdrops RIGHT NOW?
 1. Which protocols have the highest expected airdrop value?
 2. Any new testnets launched this week worth joining?
 3. Which chains are doing points programs?
 4. Any time-sensitive opportunities about to close?
 5. What's the meta for airdrop farming in February 2026?
-Be specific: protocol names, links, steps, estimated values.""")
-print(r2)
-
-print("\n" + "=" * 60)
-print("PERPLEXITY: AUTOMATABLE AIRDROP STRATEGIES")
-print("=" * 60)
-r3 = ask_perplexity("""Which crypto airdrop farming activities can be AUTOMATED with a Python script?
+Be specific: protocol names, links, steps, estimated values."""),
+    ("PERPLEXITY: AUTOMATABLE AIRDROP STRATEGIES", ask_perplexity, """Which crypto airdrop farming activities can be AUTOMATED with a Python script?
 I have:
 - An EC2 server running 24/7
 - MetaMask wallet
@@ -70,5 +82,14 @@ Examples: automated testnet faucets, bridge transactions, swap transactions,
 daily check-ins, social tasks via API.
 Give me specific Python code examples or API endpoints for each.
 Focus on highest ROI for minimal effort/capital.
-February 2026.""")
-print(r3)
+February 2026."""),
+]
+
+# Fire all queries at once (each is a 5-20s network wait), print in order
+with ThreadPoolExecutor(max_workers=len(QUERIES)) as pool:
+    futures = [pool.submit(fn, prompt) for _, fn, prompt in QUERIES]
+    for i, ((title, _, _), future) in enumerate(zip(QUERIES, futures)):
+        print(("\n" if i else "") + "=" * 60)
+        print(title)
+        print("=" * 60)
+        print(future.result())
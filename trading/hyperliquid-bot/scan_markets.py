@@ -1,80 +1,189 @@
 """Deep market scan — liquidity zones, funding rates, best setups"""
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import logging
+import operator
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from hyperliquid.info import Info
 from hyperliquid.utils import constants
+from hyperliquid.utils.error import Error as HLError
 
+import http_pool
+import rate_limit
 from env_loader import get_key
 
+logger = logging.getLogger(__name__)
+
 PERPLEXITY_KEY = get_key("PERPLEXITY_API_KEY")
 OPENROUTER_KEY = get_key("OPENROUTER_API_KEY")
 
+# Request pieces built once; each call only adds its messages
+PERPLEXITY_HEADERS = {"Authorization": f"Bearer {PERPLEXITY_KEY}", "Content-Type": "application/json"}
+OPENROUTER_HEADERS = {"Authorization": f"Bearer {OPENROUTER_KEY}", "Content-Type": "application/json"}
+_PX_BODY = {"model": "sonar-pro", "temperature": 0.1, "max_tokens": 1000}
+_GROK_BODY = {"model": "x-ai/grok-3", "temperature": 0.2, "max_tokens": 1000}
+
 info = Info(constants.MAINNET_API_URL, skip_ws=True)
+http_pool.share_session(info)  # pooled keep-alive connections for the concurrent candle fetches
+
+# One keep-alive session for the LLM calls (same two hosts every time)
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
 
 def ask_perplexity(prompt):
-    r = requests.post("https://api.perplexity.ai/chat/completions",
-        headers={"Authorization": f"Bearer {PERPLEXITY_KEY}", "Content-Type": "application/json"},
-        json={"model": "sonar-pro", "messages": [{"role": "user", "content": prompt}], "temperature": 0.1, "max_tokens": 1000},
+    r = rate_limit.post(session, "https://api.perplexity.ai/chat/completions",
+        headers=PERPLEXITY_HEADERS, json={**_PX_BODY, "messages": [{"role": "user", "content": prompt}]},
         timeout=60)
     return r.json()['choices'][0]['message']['content'] if r.status_code == 200 else f"Error {r.status_code}"
 
 def ask_grok(prompt):
-    r = requests.post("https://openrouter.ai/api/v1/chat/completions",
-        headers={"Authorization": f"Bearer {OPENROUTER_KEY}", "Content-Type": "application/json"},
-        json={"model": "x-ai/grok-3", "messages": [{"role": "user", "content": prompt}], "temperature": 0.2, "max_tokens": 1000},
+    r = rate_limit.post(session, "https://openrouter.ai/api/v1/chat/completions",
+        headers=OPENROUTER_HEADERS, json={**_GROK_BODY, "messages": [{"role": "user", "content": prompt}]},
         timeout=60)
     return r.json()['choices'][0]['message']['content'] if r.status_code == 200 else f"Error {r.status_code}"
 
+# The liquidity-zone prompt doesn't depend on the scan — start it now so the
+# LLM wait overlaps the Hyperliquid fan-out below (printed in section 2)
+LIQUIDITY_PROMPT = """As of February 10 2026, give me the KEY INSTITUTIONAL LIQUIDITY ZONES for:
+BTC, ETH, SOL, HYPE
+
+For each coin provide:
+1. Major support zones (where buy walls / institutional bids sit)
+2. Major resistance zones (where sell walls / institutional offers sit)
+3. Liquidation clusters (where leveraged positions will get liquidated)
+4. Key psychological levels
+5. Fair value gaps that haven't been filled
+
+Use real orderbook data, Coinglass liquidation maps, and recent price action.
+Be VERY specific with exact price levels."""
+llm_pool = ThreadPoolExecutor(max_workers=1)
+liquidity_future = llm_pool.submit(ask_perplexity, LIQUIDITY_PROMPT)
+
 # 1. Scan ALL markets on Hyperliquid for funding rates + volume
 print("=" * 60)
 print("SCANNING HYPERLIQUID MARKETS — FUNDING RATES + VOLUME")
 print("=" * 60)
 
-meta = info.meta()
+# Universe changes rarely — reuse a fetched meta for a few minutes across reruns
+META_CACHE_FILE = ".meta.json"
+META_CACHE_TTL_SEC = 300
+
+if os.path.exists(META_CACHE_FILE) and time.time() - os.path.getmtime(META_CACHE_FILE) < META_CACHE_TTL_SEC:
+    with open(META_CACHE_FILE) as f:
+        meta = json.load(f)
+else:
+    meta = info.meta()
+    with open(META_CACHE_FILE, "w") as f:
+        json.dump(meta, f)
 all_assets = [m['name'] for m in meta['universe']]
 
 # Get funding rates + 24h volume for top coins
-market_data = []
-for asset in all_assets[:50]:  # Top 50
+now_ms = int(time.time() * 1000)  # one window for every request
+start_ms = now_ms - 24*3600*1000
+HOUR_MS = 3600 * 1000
+hour_bucket = now_ms // HOUR_MS
+hour_start_ms = hour_bucket * HOUR_MS
+
+# Closed hourly candles don't change: keep them on disk per asset, tagged with
+# the hour they were fetched in, so a rerun in the same hour only asks for the
+# live candle. Read here, written back from the main thread after the fan-out.
+CANDLE_CACHE_FILE = ".candles.json"
+try:
+    with open(CANDLE_CACHE_FILE) as f:
+        candle_cache = json.load(f)
+except (OSError, ValueError):
+    candle_cache = {}
+
+# close, high, low, volume of a candle in one C-level call
+_candle_row = operator.itemgetter('c', 'h', 'l', 'v')
+
+def fetch_one(asset):
+    """(asset, (n, 4) float64 array of 1h close/high/low/volume, closed candles
+    to cache or None), or None if unavailable"""
     try:
-        candles = info.candles_snapshot(name=asset, interval="1h",
-            startTime=int(time.time()*1000) - 24*3600*1000, endTime=int(time.time()*1000))
-        if not candles or len(candles) < 12:
-            continue
-
-        closes = [float(c['c']) for c in candles]
-        volumes = [float(c['v']) for c in candles]  # volume field
-
-        # Calculate volatility (24h range / price)
-        high_24h = max(float(c['h']) for c in candles)
-        low_24h = min(float(c['l']) for c in candles)
-        price = closes[-1]
-        volatility = (high_24h - low_24h) / price * 100
-
-        # RSI
-        prices = np.array(closes)
-        if len(prices) > 14:
-            deltas = np.diff(prices)
-            gains = np.where(deltas > 0, deltas, 0)
-            losses = np.where(deltas < 0, -deltas, 0)
-            avg_g = np.mean(gains[-14:])
-            avg_l = np.mean(losses[-14:])
-            rsi = 100 - (100 / (1 + avg_g/avg_l)) if avg_l > 0 else 100
+        cached = candle_cache.get(asset)
+        if cached and cached["bucket"] == hour_bucket:
+            live = info.candles_snapshot(name=asset, interval="1h",
+                startTime=hour_start_ms, endTime=now_ms)
+            candles = [c for c in cached["candles"] if c['t'] + HOUR_MS > start_ms] + \
+                      [c for c in live if c['t'] >= hour_start_ms]
+            to_cache = None
         else:
-            rsi = 50
-
-        total_vol = sum(volumes)
+            candles = info.candles_snapshot(name=asset, interval="1h",
+                startTime=start_ms, endTime=now_ms)
+            to_cache = [c for c in candles if c['t'] < hour_start_ms]
+        if not candles or len(candles) < 12:
+            return None
+        return (asset, np.array(list(map(_candle_row, candles)), dtype=np.float64),
+                to_cache)
+    except (requests.Timeout, requests.ConnectionError):
+        raise  # transient — fetch_with_retry decides
+    except (requests.RequestException, HLError, KeyError, ValueError) as e:
+        logger.warning("%s: skipped (%s)", asset, e)
+        return None
+
+def fetch_with_retry(asset, attempts=2):
+    """fetch_one, retrying timeouts / dropped connections with exponential backoff"""
+    for i in range(attempts):
+        try:
+            return fetch_one(asset)
+        except (requests.Timeout, requests.ConnectionError) as e:
+            if i == attempts - 1:
+                logger.warning("%s: giving up after %d attempts (%s)", asset, attempts, e)
+                return None
+            time.sleep(2 ** i)
+
+# 50 independent round-trips — fan them out (the SDK is blocking, so threads)
+with ThreadPoolExecutor(max_workers=16) as ex:
+    results = [r for r in ex.map(fetch_with_retry, all_assets[:50]) if r]  # Top 50
+fetched = [(asset, arr) for asset, arr, _ in results]
+
+fresh = {asset: {"bucket": hour_bucket, "candles": closed}
+         for asset, _, closed in results if closed is not None}
+if fresh:
+    candle_cache.update(fresh)
+    try:
+        with open(CANDLE_CACHE_FILE, "w") as f:
+            json.dump(candle_cache, f)
+    except OSError:
+        pass
 
+# Stats for every asset at once: right-align the series into one (assets, hours)
+# matrix, NaN-padded on the left where an asset has fewer candles
+market_data = []
+if fetched:
+    lengths = np.array([len(arr) for _, arr in fetched])
+    width = int(lengths.max())
+    mat = np.full((len(fetched), width, 4), np.nan)
+    for i, (_, arr) in enumerate(fetched):
+        mat[i, width - len(arr):] = arr
+    closes, highs, lows, volumes = mat[..., 0], mat[..., 1], mat[..., 2], mat[..., 3]
+
+    price = closes[:, -1]
+    first = closes[np.arange(len(fetched)), width - lengths]
+    high_24h = np.nanmax(highs, axis=1)
+    low_24h = np.nanmin(lows, axis=1)
+    volatility = (high_24h - low_24h) / price * 100  # 24h range / price
+    total_vol = np.nansum(volumes, axis=1)
+
+    # RSI over the last 14 moves; 50 where there are fewer than 15 closes
+    deltas = np.diff(closes[:, -15:], axis=1)
+    avg_g = np.maximum(deltas, 0).mean(axis=1)
+    avg_l = avg_g - deltas.mean(axis=1)  # mean(max(-d, 0)) == mean(max(d, 0)) - mean(d)
+    rsi = np.where(avg_l > 0, 100 - 100 / (1 + avg_g / np.maximum(avg_l, 1e-12)), 100.0)
+    rsi = np.where(lengths > 14, rsi, 50.0)
+
+    for i, (asset, _) in enumerate(fetched):
         market_data.append({
-            "asset": asset, "price": price, "rsi_1h": rsi,
-            "volatility_24h": volatility, "volume_24h": total_vol,
-            "high_24h": high_24h, "low_24h": low_24h,
-            "change_24h": (price - closes[0]) / closes[0] * 100
+            "asset": asset, "price": float(price[i]), "rsi_1h": float(rsi[i]),
+            "volatility_24h": float(volatility[i]), "volume_24h": float(total_vol[i]),
+            "high_24h": float(high_24h[i]), "low_24h": float(low_24h[i]),
+            "change_24h": float((price[i] - first[i]) / first[i] * 100)
         })
-    except:
-        continue
 
 # Sort by volatility (most volatile = most opportunity)
 market_data.sort(key=lambda x: x['volatility_24h'], reverse=True)
@@ -103,18 +212,8 @@ print("PERPLEXITY: INSTITUTIONAL LIQUIDITY ZONES")
 print("=" * 60)
 
 top_assets = [m['asset'] for m in market_data[:10]]
-r1 = ask_perplexity(f"""As of February 10 2026, give me the KEY INSTITUTIONAL LIQUIDITY ZONES for:
-BTC, ETH, SOL, HYPE
-
-For each coin provide:
-1. Major support zones (where buy walls / institutional bids sit)
-2. Major resistance zones (where sell walls / institutional offers sit)
-3. Liquidation clusters (where leveraged positions will get liquidated)
-4. Key psychological levels
-5. Fair value gaps that haven't been filled
-
-Use real orderbook data, Coinglass liquidation maps, and recent price action.
-Be VERY specific with exact price levels.""")
+r1 = liquidity_future.result()
+llm_pool.shutdown()
 print(r1)
 
 # 3. Grok — what are traders actually playing right now
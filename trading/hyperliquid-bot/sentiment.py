@@ -3,9 +3,24 @@
 import logging
 import re
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 import config
+import llm_cache
+import rate_limit
+
+try:
+    import httpx
+    import h2  # noqa: F401 — required by httpx for http2=True
+except ImportError:  # optional — falls back to a pooled requests.Session (HTTP/1.1)
+    httpx = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional speedup — the regex counters below give identical counts
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
@@ -22,20 +37,111 @@ USELESS_PHRASES = [
     "no current twitter",
     "limited direct",
 ]
+USELESS_RE = re.compile("|".join(map(re.escape, USELESS_PHRASES)))
+
+# Score extraction: explicit "SCORE: x" line, else the last standalone decimal
+SCORE_RE = re.compile(r'score[:\s]+([+-]?\d+\.?\d*)', re.IGNORECASE)
+DECIMAL_RE = re.compile(r'(?:^|\s)([+-]?0\.\d+)(?:\s|$|\.)')
+
+# Keyword fallback (counts distinct words present)
+BULLISH_WORDS = ['bullish', 'recovery', 'bounce', 'support holding', 'accumulation',
+                 'buying', 'upside', 'breakout', 'rally', 'momentum up']
+BEARISH_WORDS = ['bearish', 'breakdown', 'crash', 'capitulation', 'sell-off',
+                 'declining', 'downside', 'dump', 'lower', 'weak', 'bearish momentum',
+                 'strong bearish', 'negative momentum']
+
+
+def _distinct_word_counter(words):
+    """Return count(text) -> how many of `words` occur in text, in one regex pass.
+
+    A zero-width lookahead tests every position, longest word first; any
+    shorter word matching at the same position is a prefix of the match,
+    so it is credited through `implied`.
+    """
+    ordered = sorted(set(words), key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+    implied = {w: frozenset(v for v in ordered if w.startswith(v)) for w in ordered}
+
+    def count(text):
+        found = set()
+        for match in pattern.findall(text):
+            found |= implied[match]
+        return len(found)
+    return count
+
+
+if ahocorasick is not None:
+    # One automaton for both lists: a single pass reports every (overlapping) hit
+    _KEYWORD_AC = ahocorasick.Automaton()
+    for _w in BULLISH_WORDS:
+        _KEYWORD_AC.add_word(_w, ("bull", _w))
+    for _w in BEARISH_WORDS:
+        _KEYWORD_AC.add_word(_w, ("bear", _w))
+    _KEYWORD_AC.make_automaton()
+
+    def _count_keywords(text):
+        """(distinct bullish words, distinct bearish words) present in text"""
+        seen = {hit for _, hit in _KEYWORD_AC.iter(text)}
+        bull = sum(1 for side, _ in seen if side == "bull")
+        return bull, len(seen) - bull
+else:
+    _count_bullish = _distinct_word_counter(BULLISH_WORDS)
+    _count_bearish = _distinct_word_counter(BEARISH_WORDS)
+
+    def _count_keywords(text):
+        """(distinct bullish words, distinct bearish words) present in text"""
+        return _count_bullish(text), _count_bearish(text)
+
+# Answers are reused for this long (prompts carry a 10-minute time bucket)
+SENTIMENT_CACHE_TTL_SEC = 600
+
+# Multi-asset prompts: tickers per Perplexity call, and the per-ticker score line
+PERPLEXITY_BATCH_SIZE = 8
+TICKER_SCORE_RE = re.compile(r'ticker_score[:\s]+(.*)', re.IGNORECASE)
+TICKER_PAIR_RE = re.compile(r'([A-Za-z0-9]+)\s*=\s*([+-]?\d+\.?\d*)')
+
+
+# Request body templates; each call only adds its messages (and max_tokens override)
+_PX_BODY = {"model": "sonar-pro", "temperature": 0.2, "max_tokens": 400}
+_GROK_BODY = {"model": config.GROK_MODEL, "temperature": 0.3, "max_tokens": 400}
+
+
+def _time_bucket() -> str:
+    """Now, rounded to a 10-minute bucket so reruns in the same window hit the answer cache"""
+    now = datetime.now()
+    return now.replace(minute=now.minute - now.minute % 10).strftime("%Y-%m-%d %H:%M UTC")
 
 
 class SentimentAnalyzer:
     def __init__(self):
-        # Keys read dynamically from config (which uses env_loader)
-        pass
+        # Keys read dynamically from config (which uses env_loader); headers built once
+        self._px_headers = {
+            "Authorization": f"Bearer {config.PERPLEXITY_API_KEY}",
+            "Content-Type": "application/json"
+        }
+        self._grok_headers = {
+            "Authorization": f"Bearer {config.OPENROUTER_API_KEY}",
+            "Content-Type": "application/json"
+        }
+        # Keep-alive pool to the two API hosts, lives as long as the analyzer.
+        # With httpx, concurrent calls multiplex over one HTTP/2 connection per host;
+        # its Client takes the same post(url, headers=, json=, timeout=) calls.
+        if httpx is not None:
+            self._session = httpx.Client(http2=True, limits=httpx.Limits(max_keepalive_connections=10))
+        else:
+            self._session = requests.Session()
+            self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+
+    def close(self):
+        """Release pooled connections"""
+        self._session.close()
 
     def _extract_score(self, text: str) -> float:
         """Extract sentiment score from AI response using multiple methods"""
-        text_lower = text.lower()
-
-        # Method 1: Look for SCORE: pattern anywhere
-        for line in text.strip().split('\n'):
-            match = re.search(r'score[:\s]+([+-]?\d+\.?\d*)', line, re.IGNORECASE)
+        # Method 1: Look for SCORE: pattern — from the end, since the prompt asks
+        # for it on the last line (also skips earlier "score" mentions in the prose)
+        for line in reversed(text.strip().split('\n')):
+            match = SCORE_RE.search(line)
             if match:
                 try:
                     return max(-1.0, min(1.0, float(match.group(1))))
@@ -43,22 +149,15 @@ class SentimentAnalyzer:
                     pass
 
         # Method 2: Look for standalone decimal pattern like "-0.6" or "+0.7"
-        matches = re.findall(r'(?:^|\s)([+-]?0\.\d+)(?:\s|$|\.)', text)
+        matches = DECIMAL_RE.findall(text)
         if matches:
             try:
                 return max(-1.0, min(1.0, float(matches[-1])))
             except ValueError:
                 pass
 
-        # Method 3: Keyword counting
-        bullish_words = ['bullish', 'recovery', 'bounce', 'support holding', 'accumulation',
-                         'buying', 'upside', 'breakout', 'rally', 'momentum up']
-        bearish_words = ['bearish', 'breakdown', 'crash', 'capitulation', 'sell-off',
-                         'declining', 'downside', 'dump', 'lower', 'weak', 'bearish momentum',
-                         'strong bearish', 'negative momentum']
-
-        bull_count = sum(1 for w in bullish_words if w in text_lower)
-        bear_count = sum(1 for w in bearish_words if w in text_lower)
+        # Method 3: Keyword counting (only now worth lowercasing the text)
+        bull_count, bear_count = _count_keywords(text.lower())
 
         if bear_count > bull_count:
             return -0.6 if bear_count >= 4 else (-0.4 if bear_count >= 2 else -0.2)
@@ -69,8 +168,27 @@ class SentimentAnalyzer:
 
     def _is_useless_response(self, text: str) -> bool:
         """Detect when Grok can't provide useful analysis (no Twitter access)"""
-        text_lower = text.lower()
-        return any(phrase in text_lower for phrase in USELESS_PHRASES)
+        return USELESS_RE.search(text.lower()) is not None
+
+    def _ask_perplexity(self, prompt: str, max_tokens: int) -> Optional[str]:
+        """Perplexity answer for prompt (answer cache first); None on an API error"""
+        cache_key = llm_cache.make_key(_PX_BODY["model"], prompt)
+        analysis = llm_cache.get(cache_key)
+        if analysis is None:
+            response = rate_limit.post(
+                self._session,
+                "https://api.perplexity.ai/chat/completions",
+                headers=self._px_headers,
+                json={**_PX_BODY, "max_tokens": max_tokens,
+                      "messages": [{"role": "user", "content": prompt}]},
+                timeout=45
+            )
+            if response.status_code != 200:
+                logger.error("Perplexity API error: %s", response.status_code)
+                return None
+            analysis = response.json()['choices'][0]['message']['content']
+            llm_cache.put(cache_key, analysis, SENTIMENT_CACHE_TTL_SEC)
+        return analysis
 
     def get_perplexity_analysis(self, asset: str) -> Optional[Dict]:
         """Get macro analysis + directional bias from Perplexity"""
@@ -78,45 +196,71 @@ class SentimentAnalyzer:
             return None
 
         try:
-            today = datetime.now().strftime("%Y-%m-%d %H:%M UTC")
             prompt = (
-                f"You are a crypto trading analyst. Analyze {asset} market conditions right now ({today}). "
+                f"You are a crypto trading analyst. Analyze {asset} market conditions right now ({_time_bucket()}). "
                 f"Cover: price action, key support/resistance levels, recent news catalysts, "
                 f"funding rates, whale activity, and macro factors. "
                 f"Then give a directional score from -1.0 (very bearish) to +1.0 (very bullish). "
                 f"Format your last line EXACTLY as: SCORE: [number]"
             )
 
-            response = requests.post(
-                "https://api.perplexity.ai/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {config.PERPLEXITY_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "sonar-pro",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.2,
-                    "max_tokens": 400
-                },
-                timeout=45
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                analysis = result['choices'][0]['message']['content']
-                logger.info("Perplexity [%s]: %s...", asset, analysis[:200])
-
-                score = self._extract_score(analysis)
-                return {"analysis": analysis, "score": score}
-            else:
-                logger.error("Perplexity API error: %s", response.status_code)
+            analysis = self._ask_perplexity(prompt, max_tokens=400)
+            if analysis is None:
                 return None
 
+            logger.info("Perplexity [%s]: %s...", asset, analysis[:200])
+            score = self._extract_score(analysis)
+            return {"analysis": analysis, "score": score}
+
         except Exception as e:
             logger.error("Perplexity error for %s: %s", asset, e)
             return None
 
+    def get_perplexity_analyses(self, assets: List[str]) -> Dict[str, Dict]:
+        """Perplexity analysis for several assets, up to PERPLEXITY_BATCH_SIZE per call.
+
+        Each call asks for one `TICKER_SCORE: BTC=-0.3, ETH=0.1` line; assets
+        missing from it (or from a failed call) are left out of the result.
+        """
+        if not config.PERPLEXITY_API_KEY:
+            return {}
+
+        results = {}
+        for i in range(0, len(assets), PERPLEXITY_BATCH_SIZE):
+            batch = assets[i:i + PERPLEXITY_BATCH_SIZE]
+            tickers = ", ".join(batch)
+            try:
+                prompt = (
+                    f"You are a crypto trading analyst. For each of {tickers}, analyze market conditions "
+                    f"right now ({_time_bucket()}): price action, key support/resistance levels, recent news "
+                    f"catalysts, funding rates, whale activity, and macro factors. Keep each analysis brief. "
+                    f"Give each a directional score from -1.0 (very bearish) to +1.0 (very bullish). "
+                    f"Format your last line EXACTLY as: TICKER_SCORE: "
+                    + ", ".join(f"{a}=[number]" for a in batch)
+                )
+
+                analysis = self._ask_perplexity(prompt, max_tokens=150 + 250 * len(batch))
+                if analysis is None:
+                    continue
+
+                scores = {}
+                for line in analysis.strip().split('\n'):
+                    match = TICKER_SCORE_RE.search(line)
+                    if match:
+                        scores = {t.upper(): float(v) for t, v in TICKER_PAIR_RE.findall(match.group(1))}
+                for asset in batch:
+                    if asset.upper() in scores:
+                        results[asset] = {
+                            "analysis": analysis,
+                            "score": max(-1.0, min(1.0, scores[asset.upper()])),
+                        }
+                logger.info("Perplexity [%s]: %d/%d scored", tickers, len(scores), len(batch))
+
+            except Exception as e:
+                logger.error("Perplexity error for %s: %s", tickers, e)
+
+        return results
+
     def get_twitter_sentiment(self, asset: str) -> Optional[Dict]:
         """Get Twitter/X sentiment via Grok"""
         if not config.OPENROUTER_API_KEY:
@@ -139,48 +283,42 @@ class SentimentAnalyzer:
                 f"Format your last line EXACTLY as: SCORE: [number]"
             )
 
-            response = requests.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {config.OPENROUTER_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": config.GROK_MODEL,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.3,
-                    "max_tokens": 400
-                },
-                timeout=45
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                analysis = result['choices'][0]['message']['content']
-                logger.info("Grok [%s]: %s...", asset, analysis[:200])
-
-                # Detect useless responses
-                if self._is_useless_response(analysis):
-                    logger.info("Grok [%s]: useless response (no Twitter data), skipping", asset)
+            cache_key = llm_cache.make_key(_GROK_BODY["model"], prompt)
+            analysis = llm_cache.get(cache_key)
+            if analysis is None:
+                response = rate_limit.post(
+                    self._session,
+                    "https://openrouter.ai/api/v1/chat/completions",
+                    headers=self._grok_headers,
+                    json={**_GROK_BODY, "messages": [{"role": "user", "content": prompt}]},
+                    timeout=45
+                )
+                if response.status_code != 200:
+                    logger.error("Grok API error: %s", response.status_code)
                     return None
+                analysis = response.json()['choices'][0]['message']['content']
+                llm_cache.put(cache_key, analysis, SENTIMENT_CACHE_TTL_SEC)
+
+            logger.info("Grok [%s]: %s...", asset, analysis[:200])
 
-                score = self._extract_score(analysis)
-                return {"score": score, "analysis": analysis}
-            else:
-                logger.error("Grok API error: %s", response.status_code)
+            # Detect useless responses
+            if self._is_useless_response(analysis):
+                logger.info("Grok [%s]: useless response (no Twitter data), skipping", asset)
                 return None
 
+            score = self._extract_score(analysis)
+            return {"score": score, "analysis": analysis}
+
         except Exception as e:
             logger.error("Grok error for %s: %s", asset, e)
             return None
 
-    def get_combined_bias(self, asset: str) -> Dict:
-        """Get directional bias from Perplexity (Grok disabled — no OpenRouter credits)"""
+    def _combine(self, asset: str, perplexity: Optional[Dict]) -> Dict:
+        """Bias dict from the provider results (Perplexity only for now)"""
         score = 0.0
         analyses = {}
         sources = 0
 
-        perplexity = self.get_perplexity_analysis(asset)
         if perplexity:
             score = perplexity["score"]
             analyses["perplexity"] = perplexity["analysis"]
@@ -202,3 +340,21 @@ class SentimentAnalyzer:
             "analyses": analyses,
             "sources": sources
         }
+
+    def get_combined_bias(self, asset: str) -> Dict:
+        """Get directional bias from Perplexity (Grok disabled — no OpenRouter credits)"""
+        return self._combine(asset, self.get_perplexity_analysis(asset))
+
+    def get_combined_bias_many(self, assets: List[str]) -> Dict[str, Dict]:
+        """get_combined_bias for several assets: one batched Perplexity prompt per
+        PERPLEXITY_BATCH_SIZE assets; any the batch didn't score are asked one by
+        one, concurrently. The bot's entry scan prefetches its biases through this."""
+        if not assets:
+            return {}
+        batched = self.get_perplexity_analyses(assets)
+        results = {a: self._combine(a, batched[a]) for a in assets if a in batched}
+        missing = [a for a in assets if a not in batched]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(len(missing), PERPLEXITY_BATCH_SIZE)) as pool:
+                results.update(zip(missing, pool.map(self.get_combined_bias, missing)))
+        return {a: results[a] for a in assets}
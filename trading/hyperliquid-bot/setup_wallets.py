@@ -6,10 +6,21 @@ from eth_account import Account
 WALLETS_FILE = "farming_wallets.json"
 
 def generate_wallets(count=3):
-    """Generate EVM wallets for testnet farming"""
+    """Generate EVM wallets for testnet farming (None if WALLETS_FILE already exists)"""
+    # Check before generating, so no addresses are printed for keys we'd discard
+    if os.path.exists(WALLETS_FILE):
+        print(f"{WALLETS_FILE} already exists — not overwriting it")
+        return None
+
+    # All key material in one CSPRNG read, sliced into 32-byte secp256k1 keys
+    # (eth_keys uses the C-backed coincurve for derivation when it's installed)
+    raw = os.urandom(32 * count)
     wallets = []
     for i in range(count):
-        acct = Account.create()
+        try:
+            acct = Account.from_key(raw[i * 32:(i + 1) * 32])
+        except ValueError:  # zero / >= curve order: ~2**-128 odds, draw a fresh key
+            acct = Account.create()
         wallets.append({
             "name": f"farmer_{i+1}",
             "address": acct.address,
@@ -17,9 +28,15 @@ def generate_wallets(count=3):
         })
         print(f"Wallet {i+1}: {acct.address}")
 
-    with open(WALLETS_FILE, 'w') as f:
+    # Created owner-only in one step (no world-readable window before a chmod);
+    # O_EXCL refuses to clobber an existing wallets file
+    try:
+        fd = os.open(WALLETS_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:  # created by someone else since the check above
+        print(f"{WALLETS_FILE} appeared while generating — keys above were NOT saved")
+        return None
+    with os.fdopen(fd, 'w') as f:
         json.dump(wallets, f, indent=2)
-    os.chmod(WALLETS_FILE, 0o600)
 
     print(f"\nSaved {count} wallets to {WALLETS_FILE}")
     print("Add these to your testnet faucets and bridge interactions")
@@ -1,11 +1,13 @@
 """Strategy adaptation engine — learns from trade history to adjust parameters"""
 
+import io
 import json
 import logging
 import os
 import time
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+from collections import deque
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +33,8 @@ SIGNAL_TO_WEIGHT = {
     "trending": "adx",
     "ai_bias_aligned": "ai_bias",
 }
+# (signal key, weight key) pairs adapt() walks — same order as TradeTracker's per_signal
+_ADAPTABLE_SIGNALS = tuple(SIGNAL_TO_WEIGHT.items())
 
 # Adaptation thresholds
 MIN_TRADES_FOR_ADAPT = 20
@@ -40,6 +44,18 @@ MAX_WEIGHT = 2.0
 MIN_TRADES_FOR_BLOCK = 5
 BLOCK_WIN_RATE_THRESHOLD = 30
 BLOCK_COOLDOWN_HOURS = 24
+ADAPTATION_LOG_SIZE = 10
+# With no changes, an adaptation only moves timestamps/counters: persist at most this often
+IDLE_SAVE_INTERVAL_SEC = 30 * 60
+
+
+class AdaptSummary(NamedTuple):
+    """One adaptation_log entry (saved to disk as a dict via _asdict())"""
+    timestamp: str
+    trades_analyzed: int
+    win_rate: float
+    total_pnl: float
+    changes: Tuple[str, ...]
 
 
 class StrategyAdapter:
@@ -47,17 +63,29 @@ class StrategyAdapter:
         self.tracker = tracker
         self.state_file = state_file
         self.state = self._default_state()
+        self._last_save = 0.0
+        # Weights / blocks / threshold changed since the last successful save
+        # (stays set if a save fails, so the next adapt retries)
+        self._dirty = False
         self._load()
+        # Monotonic time of the last adaptation for interval checks (immune to
+        # wall-clock jumps); seeded from the persisted wall-clock timestamp
+        last_ts = self.state["last_adaptation_ts"]
+        self._last_adapt_mono = (time.monotonic() - max(time.time() - last_ts, 0.0)
+                                 if last_ts else None)
 
     def _default_state(self) -> Dict:
         return {
             "signal_weights": dict(DEFAULT_WEIGHTS),
             "min_score_threshold": 2,
-            "blocked_assets": [],  # [{"asset": str, "blocked_at": iso, "reason": str}]
+            # {asset: {"asset": str, "blocked_at": iso, "blocked_at_ts": epoch, "reason": str}}
+            # (saved to disk as the list of entries)
+            "blocked_assets": {},
             "last_adaptation": None,
+            "last_adaptation_ts": None,  # epoch twin of last_adaptation (ISO kept for readability)
             "adaptation_count": 0,
             "trades_at_last_adapt": 0,
-            "adaptation_log": []  # Last 10 adaptation summaries
+            "adaptation_log": deque(maxlen=ADAPTATION_LOG_SIZE)  # Last 10 adaptation summaries
         }
 
     def should_adapt(self) -> bool:
@@ -67,8 +95,7 @@ class StrategyAdapter:
         - 20+ new trades since last adaptation, OR
         - 6+ hours since last adaptation (if we have any closed trades)
         """
-        stats = self.tracker.get_stats()
-        total = stats["total_trades"]
+        total = self.tracker.total_trades  # O(1); no full get_stats() pass per tick
 
         # Need at least some trades
         if total < 5:
@@ -80,9 +107,8 @@ class StrategyAdapter:
             return True
 
         # Check time threshold
-        if self.state["last_adaptation"]:
-            last = datetime.fromisoformat(self.state["last_adaptation"])
-            if datetime.now() - last > timedelta(hours=ADAPT_INTERVAL_HOURS):
+        if self._last_adapt_mono is not None:
+            if time.monotonic() - self._last_adapt_mono > ADAPT_INTERVAL_HOURS * 3600:
                 return trades_since > 0  # Only if there are new trades
         else:
             # Never adapted before, adapt if we have enough trades
@@ -101,6 +127,10 @@ class StrategyAdapter:
         """
         stats = self.tracker.get_stats(last_n=MIN_TRADES_FOR_ADAPT)
         changes = []
+        # One clock read for the whole pass
+        now = time.time()
+        now_iso = datetime.fromtimestamp(now).isoformat()
+        unblock_cutoff = now - BLOCK_COOLDOWN_HOURS * 3600
 
         if stats["total_trades"] < MIN_TRADES_FOR_BLOCK:
             logger.info("[ADAPTER] Not enough trades for adaptation")
@@ -125,12 +155,10 @@ class StrategyAdapter:
 
         # 2. Adjust signal weights based on per-signal performance
         per_signal = stats.get("per_signal", {})
-        for signal_key, signal_stats in per_signal.items():
-            weight_key = SIGNAL_TO_WEIGHT.get(signal_key)
-            if not weight_key:
-                continue
-            if signal_stats["times_active"] < 3:
-                continue  # Not enough data
+        for signal_key, weight_key in _ADAPTABLE_SIGNALS:
+            signal_stats = per_signal.get(signal_key)
+            if signal_stats is None or signal_stats["times_active"] < 3:
+                continue  # Not tracked / not enough data
 
             old_weight = self.state["signal_weights"].get(weight_key, 1.0)
             new_weight = old_weight
@@ -148,50 +176,50 @@ class StrategyAdapter:
                 )
 
         # 3. Manage blocked assets
+        blocked_assets = self.state["blocked_assets"]
         per_asset = stats.get("per_asset", {})
         for asset, asset_stats in per_asset.items():
             if (asset_stats["trades"] >= MIN_TRADES_FOR_BLOCK
                     and asset_stats["win_rate"] < BLOCK_WIN_RATE_THRESHOLD):
-                if not self._is_blocked(asset):
-                    self.state["blocked_assets"].append({
+                if asset not in blocked_assets:
+                    blocked_assets[asset] = {
                         "asset": asset,
-                        "blocked_at": datetime.now().isoformat(),
+                        "blocked_at": now_iso,
+                        "blocked_at_ts": now,
                         "reason": f"WR={asset_stats['win_rate']}% on {asset_stats['trades']} trades"
-                    })
+                    }
                     changes.append(
                         f"BLOCKED {asset} (WR={asset_stats['win_rate']}% "
                         f"on {asset_stats['trades']} trades)"
                     )
 
         # 4. Unblock assets after cooldown period
-        still_blocked = []
-        for blocked in self.state["blocked_assets"]:
-            blocked_at = datetime.fromisoformat(blocked["blocked_at"])
-            if datetime.now() - blocked_at > timedelta(hours=BLOCK_COOLDOWN_HOURS):
-                changes.append(
-                    f"UNBLOCKED {blocked['asset']} (cooldown expired, second chance)"
-                )
-            else:
-                still_blocked.append(blocked)
-        self.state["blocked_assets"] = still_blocked
+        for asset in [a for a, b in blocked_assets.items() if b["blocked_at_ts"] < unblock_cutoff]:
+            del blocked_assets[asset]
+            changes.append(
+                f"UNBLOCKED {asset} (cooldown expired, second chance)"
+            )
 
         # 5. Record adaptation
-        self.state["last_adaptation"] = datetime.now().isoformat()
+        self.state["last_adaptation"] = now_iso
+        self.state["last_adaptation_ts"] = now
+        self._last_adapt_mono = time.monotonic()
         self.state["adaptation_count"] += 1
         self.state["trades_at_last_adapt"] = stats["total_trades"]
 
-        adaptation_summary = {
-            "timestamp": datetime.now().isoformat(),
-            "trades_analyzed": stats["total_trades"],
-            "win_rate": stats["win_rate"],
-            "total_pnl": stats["total_pnl"],
-            "changes": changes
-        }
-        self.state["adaptation_log"].append(adaptation_summary)
-        # Keep only last 10 logs
-        self.state["adaptation_log"] = self.state["adaptation_log"][-10:]
+        adaptation_summary = AdaptSummary(
+            timestamp=now_iso,
+            trades_analyzed=stats["total_trades"],
+            win_rate=stats["win_rate"],
+            total_pnl=stats["total_pnl"],
+            changes=tuple(changes),
+        )
+        self.state["adaptation_log"].append(adaptation_summary)  # deque drops the oldest past 10
 
-        self._save()
+        if changes:
+            self._dirty = True
+        if self._dirty or now - self._last_save > IDLE_SAVE_INTERVAL_SEC:
+            self._save()
 
         if changes:
             logger.info(f"[ADAPTER] Adaptation #{self.state['adaptation_count']}:")
@@ -225,21 +253,20 @@ class StrategyAdapter:
         - Recent changes
         """
         stats = self.tracker.get_stats()
-        lines = [
-            "=" * 50,
-            "STRATEGY ADAPTER REPORT",
-            "=" * 50,
-            f"Total trades: {stats['total_trades']} | "
-            f"Wins: {stats['wins']} | Losses: {stats['losses']}",
-            f"Win rate: {stats['win_rate']}% | "
-            f"Total PnL: ${stats['total_pnl']:+.4f}",
-            f"Profit factor: {stats['profit_factor']}",
-            f"Avg win: ${stats['avg_win']:+.4f} | "
-            f"Avg loss: ${stats['avg_loss']:.4f}",
-            "",
-            f"Score threshold: {self.state['min_score_threshold']}",
-            "Signal weights:"
-        ]
+        rule = "=" * 50 + "\n"
+        buf = io.StringIO()
+        w = buf.write
+        w(rule)
+        w("STRATEGY ADAPTER REPORT\n")
+        w(rule)
+        w("Total trades: %d | Wins: %d | Losses: %d\n"
+          % (stats["total_trades"], stats["wins"], stats["losses"]))
+        w("Win rate: %s%% | Total PnL: $%+.4f\n" % (stats["win_rate"], stats["total_pnl"]))
+        w("Profit factor: %s\n" % (stats["profit_factor"],))
+        w("Avg win: $%+.4f | Avg loss: $%.4f\n" % (stats["avg_win"], stats["avg_loss"]))
+        w("\n")
+        w("Score threshold: %s\n" % (self.state["min_score_threshold"],))
+        w("Signal weights:\n")
 
         for signal, weight in sorted(self.state["signal_weights"].items()):
             marker = ""
@@ -247,63 +274,61 @@ class StrategyAdapter:
                 marker = " (weakened)"
             elif weight > 1.2:
                 marker = " (boosted)"
-            lines.append(f"  {signal}: {weight:.2f}{marker}")
+            w("  %s: %.2f%s\n" % (signal, weight, marker))
 
         if self.state["blocked_assets"]:
-            lines.append("")
-            lines.append("Blocked assets:")
-            for b in self.state["blocked_assets"]:
-                lines.append(f"  {b['asset']} — {b['reason']} (since {b['blocked_at'][:16]})")
+            w("\nBlocked assets:\n")
+            for b in self.state["blocked_assets"].values():
+                w("  %s — %s (since %s)\n" % (b["asset"], b["reason"], b["blocked_at"][:16]))
         else:
-            lines.append("")
-            lines.append("No blocked assets")
+            w("\nNo blocked assets\n")
 
-        lines.append("")
-        lines.append(f"Adaptations: {self.state['adaptation_count']}")
+        w("\nAdaptations: %s\n" % (self.state["adaptation_count"],))
 
         # Last adaptation changes
         if self.state["adaptation_log"]:
             last = self.state["adaptation_log"][-1]
-            if last["changes"]:
-                lines.append(f"Last changes ({last['timestamp'][:16]}):")
-                for c in last["changes"]:
-                    lines.append(f"  -> {c}")
+            if last.changes:
+                w("Last changes (%s):\n" % (last.timestamp[:16],))
+                for c in last.changes:
+                    w("  -> %s\n" % (c,))
 
         if stats.get("best_trade"):
-            lines.append("")
             bt = stats["best_trade"]
             wt = stats["worst_trade"]
-            lines.append(
-                f"Best trade: {bt['direction']} {bt['asset']} "
-                f"${bt['pnl']:+.4f} ({bt['pnl_pct']:+.1f}%)"
-            )
-            lines.append(
-                f"Worst trade: {wt['direction']} {wt['asset']} "
-                f"${wt['pnl']:+.4f} ({wt['pnl_pct']:+.1f}%)"
-            )
+            w("\nBest trade: %s %s $%+.4f (%+.1f%%)\n"
+              % (bt["direction"], bt["asset"], bt["pnl"], bt["pnl_pct"]))
+            w("Worst trade: %s %s $%+.4f (%+.1f%%)\n"
+              % (wt["direction"], wt["asset"], wt["pnl"], wt["pnl_pct"]))
 
         # Per-asset breakdown
         if stats.get("per_asset"):
-            lines.append("")
-            lines.append("Per-asset performance:")
+            w("\nPer-asset performance:\n")
             for asset, a_stats in sorted(stats["per_asset"].items()):
-                lines.append(
-                    f"  {asset}: {a_stats['trades']} trades, "
-                    f"WR={a_stats['win_rate']:.0f}%, PnL=${a_stats['pnl']:+.4f}"
-                )
+                w("  %s: %s trades, WR=%.0f%%, PnL=$%+.4f\n"
+                  % (asset, a_stats["trades"], a_stats["win_rate"], a_stats["pnl"]))
 
-        lines.append("=" * 50)
-        return "\n".join(lines)
+        w("=" * 50)
+        return buf.getvalue()
 
     def _is_blocked(self, asset: str) -> bool:
         """Internal check for blocked assets."""
-        return any(b["asset"] == asset for b in self.state["blocked_assets"])
+        return asset in self.state["blocked_assets"]
 
     def _save(self):
-        """Save state to strategy_state.json"""
+        """Save state to strategy_state.json (compact, via temp file + atomic rename)"""
+        tmp = self.state_file + ".tmp"
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(self.state, f, indent=2)
+            # On-disk format: blocked_assets as its list of entries, log entries as dicts
+            state = {**self.state,
+                     "blocked_assets": list(self.state["blocked_assets"].values()),
+                     "adaptation_log": [e._asdict() for e in self.state["adaptation_log"]]}
+            payload = json.dumps(state, separators=(',', ':')).encode()
+            with open(tmp, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp, self.state_file)
+            self._last_save = time.time()
+            self._dirty = False
         except Exception as e:
             logger.error(f"[ADAPTER] Save error: {e}")
 
@@ -321,6 +346,16 @@ class StrategyAdapter:
                 for sig, weight in DEFAULT_WEIGHTS.items():
                     if sig not in saved.get("signal_weights", {}):
                         saved["signal_weights"][sig] = weight
+                # Backfill epoch twins for state saved before they existed (parsed once here)
+                if saved["last_adaptation"] and not saved["last_adaptation_ts"]:
+                    saved["last_adaptation_ts"] = datetime.fromisoformat(saved["last_adaptation"]).timestamp()
+                saved["adaptation_log"] = deque(
+                    (AdaptSummary(**{**e, "changes": tuple(e["changes"])}) for e in saved["adaptation_log"]),
+                    maxlen=ADAPTATION_LOG_SIZE)
+                for blocked in saved["blocked_assets"]:
+                    if "blocked_at_ts" not in blocked:
+                        blocked["blocked_at_ts"] = datetime.fromisoformat(blocked["blocked_at"]).timestamp()
+                saved["blocked_assets"] = {b["asset"]: b for b in saved["blocked_assets"]}
                 self.state = saved
                 logger.info(
                     f"[ADAPTER] Loaded state: threshold={self.state['min_score_threshold']}, "
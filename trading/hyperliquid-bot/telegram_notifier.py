@@ -1,36 +1,93 @@
 """Telegram notification module for the Hyperliquid trading bot."""
+import atexit
+import functools
 import logging
-import urllib.request
-import urllib.parse
+import queue
+import threading
 import json
+from concurrent.futures import ThreadPoolExecutor
 
+import requests
+from requests.adapters import HTTPAdapter
+
+import rate_limit
 from env_loader import get_key
 
+try:
+    import orjson
+    _json_dumps = orjson.dumps  # bytes, raw UTF-8
+except ImportError:  # optional speedup — stdlib json works the same, just slower
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 logger = logging.getLogger(__name__)
 
-_BOT_TOKEN = None
-_CHAT_ID = None
-_PERPLEXITY_KEY = None
+# Messages go through a background queue onto a pooled keep-alive session
+# (api.telegram.org, api.perplexity.ai), so callers never wait on a TLS
+# handshake; messages that arrive within DEBOUNCE_SEC of each other are
+# coalesced into one send.
+DEBOUNCE_SEC = 0.5
+MAX_MESSAGE_LEN = 4096  # Telegram's sendMessage limit
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Trade-open alerts: sent at once, then edited to add the Perplexity comment.
+# Each comment task is submitted before its sender, so FIFO order guarantees a
+# sender waiting on its comment never starves it of a worker.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="telegram-trade")
+_queue = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+# Message label tables (built once, not per notification)
+_SIGNAL_LABELS = {  # insertion order = display order
+    "below_lower_bb": "BB Low", "above_upper_bb": "BB High",
+    "rsi_oversold": "RSI Oversold", "rsi_overbought": "RSI Overbought",
+    "trending": "Trend ADX", "momentum_bullish": "Momentum \u2191",
+    "momentum_bearish": "Momentum \u2193",
+}
+
+_REASON_LABELS = {
+    "trailing_stop": "\U0001f6e1\ufe0f Trailing stop kicked in \u2014 profit secured after retracement",
+    "tp": "\U0001f3c6 Target reached \u2014 take profit hit",
+    "sl": "\U0001f6d1 Stop loss triggered \u2014 risk contained",
+    "liquidation": "\U0001f4a3 Position liquidated \u2014 margin insufficient",
+    "manual": "\u270b Manually closed",
+    "regime_change": "\U0001f300 Market regime shifted \u2014 position no longer aligned",
+    "timeout": "\u23f0 Max hold time reached \u2014 closing stale position",
+    "drawdown": "\u26a0\ufe0f Drawdown limit hit \u2014 capital protection",
+}
+
+_REGIME_LABELS = {
+    "STRONG_BULL": "\U0001f680 Strong Bull",
+    "MILD_BULL": "\U0001f4c8 Mild Bull",
+    "RANGING": "\u2194\ufe0f Ranging",
+    "MILD_BEAR": "\U0001f4c9 Mild Bear",
+    "STRONG_BEAR": "\u2744\ufe0f Strong Bear",
+}
+
+
+# Keys are read once on first use (functools.cache, no hand-rolled globals)
+@functools.cache
+def _bot_token():
+    return get_key("TELEGRAM_BOT_TOKEN")
 
 
-def _get_config():
-    global _BOT_TOKEN, _CHAT_ID
-    if _BOT_TOKEN is None:
-        _BOT_TOKEN = get_key("TELEGRAM_BOT_TOKEN")
-        _CHAT_ID = get_key("TELEGRAM_CHAT_ID")
-    return _BOT_TOKEN, _CHAT_ID
+@functools.cache
+def _chat_id():
+    return get_key("TELEGRAM_CHAT_ID")
 
 
-def _get_perplexity_key():
-    global _PERPLEXITY_KEY
-    if _PERPLEXITY_KEY is None:
-        _PERPLEXITY_KEY = get_key("PERPLEXITY_API_KEY", required=False) or ""
-    return _PERPLEXITY_KEY
+@functools.cache
+def _perplexity_key():
+    return get_key("PERPLEXITY_API_KEY", required=False) or ""
 
 
 def _generate_trade_comment(asset, direction, entry_price, signals, context="open"):
     """Generate a short trade explanation via Perplexity Sonar (cheap & fast)."""
-    key = _get_perplexity_key()
+    key = _perplexity_key()
     if not key:
         return ""
     try:
@@ -64,51 +121,135 @@ def _generate_trade_comment(asset, direction, entry_price, signals, context="ope
             f"Signals: {sig_summary or 'mixed'}. Be concise, trading jargon OK."
         )
 
-        payload = json.dumps({
+        payload = _json_dumps({
             "model": "sonar",
             "messages": [{"role": "user", "content": prompt}],
             "temperature": 0.3,
             "max_tokens": 50,
-        }).encode("utf-8")
-        req = urllib.request.Request(
-            "https://api.perplexity.ai/chat/completions",
+        })
+        resp = rate_limit.post(
+            _session, "https://api.perplexity.ai/chat/completions",
             data=payload,
-            headers={
-                "Authorization": f"Bearer {key}",
-                "Content-Type": "application/json",
-            },
+            headers={"Authorization": f"Bearer {key}", **_JSON_HEADERS},
+            timeout=8,
         )
-        with urllib.request.urlopen(req, timeout=8) as resp:
-            data = json.loads(resp.read())
-            return data["choices"][0]["message"]["content"].strip()
+        resp.raise_for_status()
+        return resp.json()["choices"][0]["message"]["content"].strip()
     except Exception:
         logger.debug("Trade comment generation failed", exc_info=True)
         return ""
 
 
-def send_message(text):
-    """Send a text message via Telegram Bot API (HTML parse mode)."""
+def _post(text, method="sendMessage", **fields):
+    """POST one Bot API call (sendMessage by default) on the pooled session; raises on HTTP errors."""
+    payload = _json_dumps({
+        "chat_id": _chat_id(),
+        "text": text,
+        "parse_mode": "HTML",
+        **fields,
+    })
+    resp = _session.post(f"https://api.telegram.org/bot{_bot_token()}/{method}",
+                         data=payload, headers=_JSON_HEADERS, timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _send_trade_open(text, comment_future):
+    """Send the alert now; once the comment resolves, edit it into the message."""
     try:
-        token, chat_id = _get_config()
-        url = f"https://api.telegram.org/bot{token}/sendMessage"
-        payload = json.dumps({
-            "chat_id": chat_id,
-            "text": text,
-            "parse_mode": "HTML",
-        }).encode("utf-8")
-        req = urllib.request.Request(
-            url, data=payload,
-            headers={"Content-Type": "application/json"},
-        )
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            return json.loads(resp.read())
+        sent = _post(text)
     except Exception:
         logger.exception("Telegram send_message failed")
         return None
+    if comment_future is None:
+        return sent
+    comment = comment_future.result()  # never raises: errors become ""
+    if not comment:
+        return sent
+    try:
+        return _post(f"{text}\n\n\U0001f4ac <i>{comment}</i>", method="editMessageText",
+                     message_id=sent["result"]["message_id"])
+    except Exception:
+        logger.exception("Telegram editMessageText failed")
+        return sent
+
+
+def _worker_loop():
+    """Drain the queue: wait for a message, gather whatever follows within
+    DEBOUNCE_SEC, and send it joined into as few messages as the size limit allows."""
+    while True:
+        items = [_queue.get()]
+        try:
+            while True:
+                items.append(_queue.get(timeout=DEBOUNCE_SEC))
+        except queue.Empty:
+            pass
+        try:
+            texts = []
+            for item in items:
+                try:
+                    text = item() if callable(item) else item
+                except Exception:
+                    logger.exception("Telegram message build failed")
+                    continue
+                if texts and len(texts[-1]) + len(text) + 2 <= MAX_MESSAGE_LEN:
+                    texts[-1] += "\n\n" + text
+                else:
+                    texts.append(text)
+            for text in texts:
+                try:
+                    _post(text)
+                except Exception:
+                    logger.exception("Telegram send_message failed")
+        finally:
+            for _ in items:
+                _queue.task_done()
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_worker_loop, name="telegram", daemon=True)
+            _worker.start()
+            atexit.register(flush)
 
 
-def notify_trade_open(asset, direction, size, entry_price, leverage, score, signals):
-    """Notify when a new trade is opened."""
+def flush():
+    """Block until every queued message has been sent."""
+    if _worker is not None:
+        _queue.join()
+
+
+def send_message(text, flush_async=True):
+    """Send a text message via Telegram Bot API (HTML parse mode).
+
+    By default the message is queued for the background sender and True is
+    returned; text may also be a zero-arg callable, built on the worker.
+    With flush_async=False it is sent now and the API response (None on
+    failure) returned — use this when the caller needs to know the send
+    failed, since a queued send can't report it (the queue itself is
+    flushed at exit).
+    """
+    if flush_async:
+        _ensure_worker()
+        _queue.put(text)
+        return True
+    try:
+        return _post(text() if callable(text) else text)
+    except Exception:
+        logger.exception("Telegram send_message failed")
+        return None
+
+
+def notify_trade_open(asset, direction, size, entry_price, leverage, score, signals,
+                      flush_async=True):
+    """Notify when a new trade is opened.
+
+    The alert goes out without waiting for Perplexity; the comment is fetched
+    in parallel and edited into the message. With flush_async (default) this
+    returns a Future at once, otherwise it waits and returns the API response.
+    """
     if direction == "LONG":
         arrow = "\U0001f7e2 \u2b06\ufe0f"
     else:
@@ -116,14 +257,12 @@ def notify_trade_open(asset, direction, size, entry_price, leverage, score, sign
 
     sig_parts = []
     if isinstance(signals, dict):
-        for key, label in [
-            ("below_lower_bb", "BB Low"), ("above_upper_bb", "BB High"),
-            ("rsi_oversold", "RSI Oversold"), ("rsi_overbought", "RSI Overbought"),
-            ("trending", "Trend ADX"), ("momentum_bullish", "Momentum \u2191"),
-            ("momentum_bearish", "Momentum \u2193"),
-        ]:
-            if signals.get(key):
-                sig_parts.append(f"\u2705 {label}")
+        # Only keys present in the snapshot (keys-view intersection, no copy);
+        # snapshots carry False values too, hence the truth check
+        active = signals.keys() & _SIGNAL_LABELS.keys()
+        if active:
+            sig_parts = [f"\u2705 {label}" for key, label in _SIGNAL_LABELS.items()
+                         if key in active and signals[key]]
         if signals.get("volume_confirmed"):
             sig_parts.append("\U0001f4a5 Volume OK")
         ai = signals.get("ai_bias", "")
@@ -132,24 +271,27 @@ def notify_trade_open(asset, direction, size, entry_price, leverage, score, sign
     elif isinstance(signals, list):
         sig_parts = signals
 
-    sig_str = "\n".join(f"  {s}" for s in sig_parts) if sig_parts else "  \u2014"
-
-    comment = _generate_trade_comment(asset, direction, entry_price, signals)
-    comment_line = f"\n\n\U0001f4ac <i>{comment}</i>" if comment else ""
+    # One "\n".join over the lines; signal lines go straight into the list
+    parts = [
+        f"{arrow} <b>NEW {direction} {asset}</b>",
+        "",
+        f"\U0001f4b2 Entry: <b>${entry_price:,.2f}</b>",
+        f"\u2696\ufe0f Leverage: {leverage}x",
+        f"\U0001f4e6 Size: {size}",
+        f"\U0001f3af Score: {score}/8",
+        "",
+        "\U0001f9e0 <b>Signals:</b>",
+    ]
+    if sig_parts:
+        parts.extend([f"  {s}" for s in sig_parts])
+    else:
+        parts.append("  \u2014")
 
-    text = (
-        f"{arrow} <b>NEW {direction} {asset}</b>\n"
-        f"\n"
-        f"\U0001f4b2 Entry: <b>${entry_price:,.2f}</b>\n"
-        f"\u2696\ufe0f Leverage: {leverage}x\n"
-        f"\U0001f4e6 Size: {size}\n"
-        f"\U0001f3af Score: {score}/8\n"
-        f"\n"
-        f"\U0001f9e0 <b>Signals:</b>\n"
-        f"{sig_str}"
-        f"{comment_line}"
-    )
-    return send_message(text)
+    # Skip the comment call entirely when Perplexity isn't configured
+    comment_future = (_executor.submit(_generate_trade_comment, asset, direction, entry_price, signals)
+                      if _perplexity_key() else None)
+    future = _executor.submit(_send_trade_open, "\n".join(parts), comment_future)
+    return future if flush_async else future.result()
 
 
 def notify_trade_close(asset, direction, entry_price, exit_price, pnl, pnl_pct, reason):
@@ -163,17 +305,7 @@ def notify_trade_close(asset, direction, entry_price, exit_price, pnl, pnl_pct,
 
     sign = "+" if pnl >= 0 else ""
 
-    reason_labels = {
-        "trailing_stop": "\U0001f6e1\ufe0f Trailing stop kicked in \u2014 profit secured after retracement",
-        "tp": "\U0001f3c6 Target reached \u2014 take profit hit",
-        "sl": "\U0001f6d1 Stop loss triggered \u2014 risk contained",
-        "liquidation": "\U0001f4a3 Position liquidated \u2014 margin insufficient",
-        "manual": "\u270b Manually closed",
-        "regime_change": "\U0001f300 Market regime shifted \u2014 position no longer aligned",
-        "timeout": "\u23f0 Max hold time reached \u2014 closing stale position",
-        "drawdown": "\u26a0\ufe0f Drawdown limit hit \u2014 capital protection",
-    }
-    reason_text = reason_labels.get(reason, f"\U0001f504 {reason}")
+    reason_text = _REASON_LABELS.get(reason, f"\U0001f504 {reason}")
 
     move_pct = ((exit_price - entry_price) / entry_price) * 100
 
@@ -192,14 +324,7 @@ def notify_trade_close(asset, direction, entry_price, exit_price, pnl, pnl_pct,
 
 def notify_status(balance, positions, regime, win_rate=None):
     """Send periodic status summary."""
-    regime_labels = {
-        "STRONG_BULL": "\U0001f680 Strong Bull",
-        "MILD_BULL": "\U0001f4c8 Mild Bull",
-        "RANGING": "\u2194\ufe0f Ranging",
-        "MILD_BEAR": "\U0001f4c9 Mild Bear",
-        "STRONG_BEAR": "\u2744\ufe0f Strong Bear",
-    }
-    regime_str = regime_labels.get(regime, f"\U0001f50d {regime}")
+    regime_str = _REGIME_LABELS.get(regime, f"\U0001f50d {regime}")
 
     text = (
         f"\U0001f4ca <b>BOT STATUS</b>\n"
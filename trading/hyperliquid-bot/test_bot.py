@@ -1,7 +1,8 @@
 """Test bot v4 connectivity and signals"""
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from bot import HyperliquidBot
-from indicators import get_all_signals
+from indicators import candles_to_array, get_all_signals
 import config
 
 def test():
@@ -13,14 +14,19 @@ def test():
     tier = bot.get_tier()
     print(f"Tier: ${tier['min']}-${tier['max']} | Leverage: {tier['leverage']}x")
 
-    for asset in config.ASSETS:
+    # Candle fetches are independent round-trips — run them together, print in order
+    with ThreadPoolExecutor(max_workers=min(config.SCAN_WORKERS, len(config.ASSETS))) as ex:
+        futures = {a: ex.submit(bot.get_candles_raw, a, config.LOOKBACK_CANDLES) for a in config.ASSETS}
+
+    for asset, future in futures.items():
         print(f"\n--- {asset} ---")
-        candles = bot.get_candles_raw(asset, config.LOOKBACK_CANDLES)
+        candles = future.result()
         if not candles:
             print(f"  No candles for {asset}")
             continue
 
-        signals = get_all_signals(candles)
+        # One typed (N, 4) array per asset; the indicators run vectorized over its columns
+        signals = get_all_signals(candles_to_array(candles))
         if signals:
             print(f"  Price: ${signals['price']:.2f}")
             print(f"  RSI: {signals['rsi']:.1f}")
@@ -18,8 +18,11 @@ import json
 import logging
 import random
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Tuple
+import requests
+from requests.adapters import HTTPAdapter
 from web3 import Web3
 from eth_account import Account
 
@@ -35,6 +38,14 @@ logger = logging.getLogger(__name__)
 
 WALLETS_FILE = "farming_wallets.json"
 FARM_STATE_FILE = "farm_state.json"
+FARM_WORKERS = 16  # (chain, wallet) pipelines farmed concurrently — each is mostly sleeps and RPC wait
+RPC_TIMEOUT_SEC = 15
+CONNECTED_TTL_SEC = 60  # Reuse an is_connected() result this long (saves a web3_clientVersion RPC per call)
+GAS_PRICE_TTL_SEC = 60  # Wallets farming the same chain share one gas price quote for this long
+
+# Keep-alive session shared by every testnet provider — one TLS handshake per RPC host, not per call
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
 
 # Confirmed working RPC endpoints
 TESTNETS = {
@@ -71,16 +82,34 @@ TESTNETS = {
 }
 
 
+def farm_all_wallets(jobs: List, action_fn) -> List:
+    """Run action_fn(job) for every job (a wallet, or a (net_key, wallet) pair)
+    concurrently; results in job order"""
+    if not jobs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(FARM_WORKERS, len(jobs))) as ex:
+        return list(ex.map(action_fn, jobs))
+
+
 class TestnetFarmer:
     def __init__(self):
         self.wallets = self._load_wallets()
         self.state = self._load_state()
+        self._w3_cache: Dict[str, Web3] = {}
+        self._connected_at: Dict[str, float] = {}  # net_key -> monotonic time of last good is_connected()
+        # Next nonce per (net_key, address), advanced locally after each send and
+        # reconciled with the chain's pending count once per batch (max of the two)
+        self._nonce_cache: Dict[Tuple[str, str], int] = {}
+        self._gas_cache: Dict[str, Tuple[int, float]] = {}  # net_key -> (gas price wei, monotonic fetch time)
         logger.info(f"Farmer initialized with {len(self.wallets)} wallets")
 
     def _load_wallets(self) -> List[Dict]:
         if os.path.exists(WALLETS_FILE):
             with open(WALLETS_FILE, 'r') as f:
-                return json.load(f)
+                wallets = json.load(f)
+            for w in wallets:  # checksummed once here, not per tx (in memory only)
+                w["checksum"] = Web3.to_checksum_address(w["address"])
+            return wallets
         return []
 
     def _load_state(self) -> Dict:
@@ -93,37 +122,117 @@ class TestnetFarmer:
         with open(FARM_STATE_FILE, 'w') as f:
             json.dump(self.state, f, indent=2, default=str)
 
-    def check_balances(self):
-        """Check balances on all chains — identify which are funded"""
-        logger.info("Checking balances across all chains...")
+    def _get_w3(self, net_key: str) -> Web3:
+        """One Web3 per testnet, on the shared keep-alive session"""
+        w3 = self._w3_cache.get(net_key)
+        if w3 is None:
+            provider = Web3.HTTPProvider(TESTNETS[net_key]["rpc"],
+                                         request_kwargs={"timeout": RPC_TIMEOUT_SEC}, session=_session)
+            w3 = self._w3_cache.setdefault(net_key, Web3(provider))
+        return w3
+
+    def _is_connected(self, net_key: str, w3: Web3) -> bool:
+        """w3.is_connected(), with a positive result reused for CONNECTED_TTL_SEC"""
+        now = time.monotonic()
+        if now - self._connected_at.get(net_key, -CONNECTED_TTL_SEC) < CONNECTED_TTL_SEC:
+            return True
+        if w3.is_connected():
+            self._connected_at[net_key] = now
+            return True
+        return False
+
+    def _batch_balances(self, net_key: str) -> List[int]:
+        """Every wallet's balance (wei, wallet order) in one JSON-RPC batch round-trip.
+
+        Raises if the RPC rejects batching or any call in it, so callers can fall back.
+        """
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": "eth_getBalance", "params": [w["address"], "latest"]}
+            for i, w in enumerate(self.wallets)
+        ]
+        resp = _session.post(TESTNETS[net_key]["rpc"], json=payload, timeout=RPC_TIMEOUT_SEC)
+        resp.raise_for_status()
+        data = resp.json()
+        if not isinstance(data, list):
+            raise ValueError(f"JSON-RPC batch not supported: {str(data)[:80]}")
+        by_id = {item.get("id"): item.get("result") for item in data}
+        if any(by_id.get(i) is None for i in range(len(self.wallets))):
+            raise ValueError(f"JSON-RPC batch incomplete: {str(data)[:80]}")
+        self._connected_at[net_key] = time.monotonic()  # a good answer proves the RPC is up
+        return [int(by_id[i], 16) for i in range(len(self.wallets))]
+
+    def _check_chain(self, net_key: str) -> Tuple[Dict[str, float], bool, List[Tuple[str, str, str]]]:
+        """Balances of every wallet on one chain.
+
+        Returns (balance updates for state["balances"], whether any wallet is
+        funded, unfunded (name, address, faucet) entries). Touches no shared
+        state, so chains can be checked side by side.
+        """
+        net_config = TESTNETS[net_key]
+        updates: Dict[str, float] = {}
+        funded = False
         unfunded = []
 
-        for net_key, net_config in TESTNETS.items():
-            if net_key == "monad_ankr":
-                continue  # Same chain, skip duplicate
+        w3 = self._get_w3(net_key)
+        try:
+            balances = self._batch_balances(net_key)
+        except Exception as e:
+            logger.debug(f"  {net_config['name']}: batch balance query failed ({str(e)[:80]}), querying per wallet")
+            balances = None
 
-            for wallet in self.wallets:
-                try:
-                    w3 = Web3(Web3.HTTPProvider(net_config["rpc"], request_kwargs={"timeout": 10}))
-                    if not w3.is_connected():
+        for i, wallet in enumerate(self.wallets):
+            try:
+                if balances is not None:
+                    balance = balances[i]
+                else:
+                    if not self._is_connected(net_key, w3):
                         logger.warning(f"  {net_config['name']}: RPC offline")
                         continue
-
                     balance = w3.eth.get_balance(wallet["address"])
-                    balance_eth = w3.from_wei(balance, 'ether')
+                balance_eth = w3.from_wei(balance, 'ether')
 
-                    chain_wallet_key = f"{net_key}_{wallet['address'][:10]}"
-                    self.state.setdefault("balances", {})[chain_wallet_key] = float(balance_eth)
+                updates[f"{net_key}_{wallet['address'][:10]}"] = float(balance_eth)
 
-                    if balance > 0:
-                        if net_key not in self.state.get("funded_chains", []):
-                            self.state.setdefault("funded_chains", []).append(net_key)
-                        logger.info(f"  {net_config['name']} | {wallet['name']}: {balance_eth:.6f} ETH")
-                    else:
-                        unfunded.append((net_config['name'], wallet['address'], net_config.get('faucet_manual', '')))
+                if balance > 0:
+                    funded = True
+                    logger.info(f"  {net_config['name']} | {wallet['name']}: {balance_eth:.6f} ETH")
+                else:
+                    unfunded.append((net_config['name'], wallet['address'], net_config.get('faucet_manual', '')))
 
-                except Exception as e:
-                    logger.warning(f"  {net_config['name']} check failed: {str(e)[:80]}")
+            except Exception as e:
+                logger.warning(f"  {net_config['name']} check failed: {str(e)[:80]}")
+
+        return updates, funded, unfunded
+
+    def _gas_price(self, net_key: str, w3: Web3) -> int:
+        """w3.eth.gas_price, reused across wallets for GAS_PRICE_TTL_SEC"""
+        cached = self._gas_cache.get(net_key)
+        now = time.monotonic()
+        if cached and now - cached[1] < GAS_PRICE_TTL_SEC:
+            return cached[0]
+        gas_price = w3.eth.gas_price
+        self._gas_cache[net_key] = (gas_price, now)
+        return gas_price
+
+    def check_balances(self):
+        """Check balances on all chains — identify which are funded"""
+        logger.info("Checking balances across all chains...")
+        unfunded = []
+
+        # Independent RPC endpoints: check them together so one slow/offline
+        # chain doesn't hold up the rest; merge into state here, in chain order
+        net_keys = [k for k in TESTNETS if k != "monad_ankr"]  # monad_ankr: same chain, skip duplicate
+        if self.wallets:
+            with ThreadPoolExecutor(max_workers=len(net_keys)) as ex:
+                results = list(ex.map(self._check_chain, net_keys))
+        else:
+            results = []
+
+        for net_key, (updates, funded, chain_unfunded) in zip(net_keys, results):
+            self.state.setdefault("balances", {}).update(updates)
+            if funded and net_key not in self.state.get("funded_chains", []):
+                self.state.setdefault("funded_chains", []).append(net_key)
+            unfunded.extend(chain_unfunded)
 
         if unfunded:
             logger.info("\n  UNFUNDED — Claim faucets manually:")
@@ -154,8 +263,8 @@ class TestnetFarmer:
             return 0
 
         try:
-            w3 = Web3(Web3.HTTPProvider(net_config["rpc"], request_kwargs={"timeout": 15}))
-            if not w3.is_connected():
+            w3 = self._get_w3(net_key)
+            if not self._is_connected(net_key, w3):
                 return 0
 
             account = Account.from_key(wallet["private_key"])
@@ -164,7 +273,7 @@ class TestnetFarmer:
             if balance == 0:
                 return 0
 
-            gas_price = w3.eth.gas_price
+            gas_price = self._gas_price(net_key, w3)
             gas_cost = 21000 * gas_price
             txns_done = 0
 
@@ -173,51 +282,38 @@ class TestnetFarmer:
                 logger.info(f"  Low balance on {net_config['name']} — saving gas")
                 return 0
 
-            nonce = w3.eth.get_transaction_count(account.address)
+            nonce_key = (net_key, account.address)
+            # One pending-count read per batch: catches txs sent outside this farmer
+            # or dropped from the mempool, while the cache covers ones not yet visible
+            pending = w3.eth.get_transaction_count(account.address, "pending")
+            nonce = max(self._nonce_cache.get(nonce_key, 0), pending)
 
             # Pick random actions (1-3 per cycle)
             num_actions = random.randint(1, 3)
 
+            # Fields shared by every tx in this batch; per tx only nonce/to/value vary
+            base_tx = {'gas': 21000, 'gasPrice': gas_price, 'chainId': net_config["chain_id"]}
+            others = [w["checksum"] for w in self.wallets if w["address"] != wallet["address"]]
+
             for i in range(num_actions):
                 action = random.choice(["self_transfer", "inter_wallet", "zero_value"])
 
                 try:
                     if action == "self_transfer":
-                        tx = {
-                            'nonce': nonce,
-                            'to': account.address,
-                            'value': random.randint(1, 1000),  # Tiny amount
-                            'gas': 21000,
-                            'gasPrice': gas_price,
-                            'chainId': net_config["chain_id"]
-                        }
+                        tx = {**base_tx, 'nonce': nonce, 'to': account.address,
+                              'value': random.randint(1, 1000)}  # Tiny amount
 
                     elif action == "inter_wallet":
-                        others = [w for w in self.wallets if w["address"] != wallet["address"]]
                         if not others:
                             continue
-                        target = random.choice(others)
                         send_amount = balance // random.randint(50, 200)
                         if send_amount < gas_cost:
                             continue
-                        tx = {
-                            'nonce': nonce,
-                            'to': Web3.to_checksum_address(target["address"]),
-                            'value': send_amount,
-                            'gas': 21000,
-                            'gasPrice': gas_price,
-                            'chainId': net_config["chain_id"]
-                        }
+                        tx = {**base_tx, 'nonce': nonce, 'to': random.choice(others),
+                              'value': send_amount}
 
                     else:  # zero_value
-                        tx = {
-                            'nonce': nonce,
-                            'to': account.address,
-                            'value': 0,
-                            'gas': 21000,
-                            'gasPrice': gas_price,
-                            'chainId': net_config["chain_id"]
-                        }
+                        tx = {**base_tx, 'nonce': nonce, 'to': account.address, 'value': 0}
 
                     signed = w3.eth.account.sign_transaction(tx, wallet["private_key"])
                     tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
@@ -231,13 +327,22 @@ class TestnetFarmer:
 
                 except Exception as e:
                     logger.warning(f"  TX failed: {str(e)[:80]}")
+                    if "nonce" in str(e).lower():  # local count drifted: drop it and refetch
+                        self._nonce_cache.pop(nonce_key, None)
+                        nonce = w3.eth.get_transaction_count(account.address, "pending")
 
+            self._nonce_cache[nonce_key] = nonce
             return txns_done
 
         except Exception as e:
             logger.error(f"  Chain error {net_config['name']}: {str(e)[:80]}")
             return 0
 
+    def _farm_wallet(self, net_key: str, wallet: Dict) -> int:
+        """Staggered start per wallet (organic), then its tx batch"""
+        time.sleep(random.uniform(5, 20))
+        return self.do_transactions(net_key, wallet)
+
     def run_farming_cycle(self):
         """Full farming cycle"""
         logger.info("=" * 60)
@@ -259,11 +364,10 @@ class TestnetFarmer:
             chains = list(funded)
             random.shuffle(chains)
 
-            for net_key in chains:
-                for wallet in self.wallets:
-                    time.sleep(random.uniform(5, 20))
-                    txns = self.do_transactions(net_key, wallet)
-                    cycle_txns += txns
+            # Every (chain, wallet) pair has its own nonce, so all of them farm
+            # side by side: the cycle takes about as long as the slowest pipeline
+            jobs = [(net_key, wallet) for net_key in chains for wallet in self.wallets]
+            cycle_txns += sum(farm_all_wallets(jobs, lambda job: self._farm_wallet(*job)))
 
         self.state["total_txns"] = self.state.get("total_txns", 0) + cycle_txns
         self._save_state()
@@ -14,8 +14,14 @@ class TradeTracker:
     def __init__(self, filepath="trades_history.json"):
         self.filepath = filepath
         self.trades: List[Dict] = []
+        self._closed_count = 0  # kept in step with self.trades by _load / log_exit
         self._load()
 
+    @property
+    def total_trades(self) -> int:
+        """Number of closed trades (O(1); same as get_stats()["total_trades"])."""
+        return self._closed_count
+
     def log_entry(self, asset: str, direction: str, size: float,
                   entry_price: float, signals_snapshot: Dict, leverage: int):
         """Log the opening of a trade with all signals at entry."""
@@ -63,6 +69,7 @@ class TradeTracker:
         trade["pnl"] = round(pnl, 4)
         trade["pnl_pct"] = round(pnl_pct, 2)
         trade["status"] = "closed"
+        self._closed_count += 1
 
         self._save()
         logger.info(
@@ -72,13 +79,23 @@ class TradeTracker:
         )
         return trade
 
+    def has_closed_trades(self, current_positions: List[Dict]) -> bool:
+        """True if any trade open in history is missing from current positions."""
+        current_coins = {p['coin'] for p in current_positions}
+        return any(
+            t["status"] == "open" and t["asset"] not in current_coins
+            for t in self.trades
+        )
+
     def detect_closed_trades(self, info, account_address: str,
-                             current_positions: List[Dict]):
+                             current_positions: List[Dict],
+                             fills_by_coin: Optional[Dict[str, List[Dict]]] = None):
         """Detect trades closed between bot cycles.
 
         Compares open trades in history with current positions.
         If a trade is open in history but not in current positions,
-        uses user_fills_by_time to find exit price and reason.
+        finds exit price and reason from fills_by_coin (fills already
+        fetched by the caller) or, failing that, user_fills_by_time.
         """
         current_coins = {p['coin'] for p in current_positions}
         open_trades = [t for t in self.trades if t["status"] == "open"]
@@ -87,7 +104,7 @@ class TradeTracker:
             if trade["asset"] not in current_coins:
                 # Trade was closed externally (SL/TP hit)
                 exit_price, exit_reason = self._resolve_exit(
-                    info, account_address, trade
+                    info, account_address, trade, fills_by_coin
                 )
                 if exit_price is not None:
                     self.log_exit(trade["asset"], exit_price, exit_reason)
@@ -99,21 +116,27 @@ class TradeTracker:
                     )
                     self.log_exit(trade["asset"], trade["entry_price"], "unknown")
 
-    def _resolve_exit(self, info, account_address: str,
-                      trade: Dict) -> tuple:
-        """Use fills API to find exit price and determine reason."""
+    def _resolve_exit(self, info, account_address: str, trade: Dict,
+                      fills_by_coin: Optional[Dict[str, List[Dict]]] = None) -> tuple:
+        """Use fills to find exit price and determine reason."""
         try:
             entry_time = datetime.fromisoformat(trade["entry_time"])
             start_ms = int(entry_time.timestamp() * 1000)
-            end_ms = int(time.time() * 1000)
 
-            fills = info.user_fills_by_time(account_address, start_ms, end_ms)
-
-            # Filter fills for this asset, after entry
+            # Preloaded fills first; only hit the API if they don't cover this trade
             asset_fills = [
-                f for f in fills
-                if f.get('coin') == trade["asset"]
+                f for f in (fills_by_coin or {}).get(trade["asset"], ())
+                if f.get('time', 0) >= start_ms
             ]
+            if not asset_fills:
+                end_ms = int(time.time() * 1000)
+                fills = info.user_fills_by_time(account_address, start_ms, end_ms)
+
+                # Filter fills for this asset, after entry
+                asset_fills = [
+                    f for f in fills
+                    if f.get('coin') == trade["asset"]
+                ]
 
             if not asset_fills:
                 return None, None
@@ -320,11 +343,13 @@ class TradeTracker:
             try:
                 with open(self.filepath, 'r') as f:
                     self.trades = json.load(f)
+                self._closed_count = sum(1 for t in self.trades if t["status"] == "closed")
                 logger.info(
                     f"[TRACKER] Loaded {len(self.trades)} trades from {self.filepath}"
                 )
             except (json.JSONDecodeError, Exception) as e:
                 logger.error(f"[TRACKER] Load error: {e}")
                 self.trades = []
+                self._closed_count = 0
         else:
             self.trades = []